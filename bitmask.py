@@ -0,0 +1,3 @@
+def mask_flags(mask: int, size: int) -> str:
+    """The mask as a string of '0'/'1' indexed by square, so per-square tests avoid big-int shifts."""
+    return format(mask, 'b')[::-1].ljust(size, '0')[:size]
@@ -1,36 +1,48 @@
 import random
 from dataclasses import dataclass, field
 
-from typing import Tuple, List, Optional, cast
+from typing import Tuple, List, Optional, Dict, cast
 
 from exception import InvalidIdError
 from geometry import Dimension, GridCoordinate
 from grid_entity import GridEntity, Mover
 
-from constants import Config
-from id_factory import id_factory
+from cell import Cell
+from constants import Config, BoardStorage
+from dense_grid import DenseGrid
+from occupancy_grid import OccupancyGrid, BitboardGrid
+from zobrist import zobrist_key
 
-@dataclass
-class Cell:
-    id: int
-    coordinate: GridCoordinate
-    occupant: Optional['GridEntity'] = field(default=None)
+@dataclass(frozen=True)
+class MoveRecord:
+    """What Board.unmake_move needs to put a mover back where make_move found it."""
+    mover: Mover
+    origin: GridCoordinate
+    destination: GridCoordinate
 
-    def __post_init__(self):
-        object.__setattr__(self, 'mover_id_counter', self.id)
-        object.__setattr__(self, 'top_left_coordinate', self.coordinate)
-        object.__setattr__(self, 'occupant', self.occupant)
 
 @dataclass
 class Board:
+    """Entities on a grid of squares.
+
+    `entities` is a dict keyed by entity_key rather than a list; iterate its
+    values() for the entities themselves. Squares live in `grid`, and `cells`
+    is a read-only snapshot of frozen Cell values built on each access, so
+    occupancy only changes through the add, move and remove methods.
+    """
     MIN_ROW_COUNT = 6
     MIN_COLUMN_COUNT = 6
 
-    entities: List[GridEntity] = field(default_factory=list)
+    # Keyed by entity_key (the mover_id for movers); dict order is registration order for rendering.
+    entities: Dict[int, GridEntity] = field(default_factory=dict)
 
-    cells: Tuple[Tuple[Cell, ...], ...] = field(init=False, repr=False)
     dimension: Dimension = field(
         default_factory=lambda: Dimension(length=Config.COLUMN_COUNT, height=Config.ROW_COUNT))
+    storage: BoardStorage = BoardStorage.CELLS
+    grid: OccupancyGrid = field(init=False, repr=False)
+    # XOR of zobrist_key(entity, top-left square) over every placed entity.
+    zobrist_hash: int = field(init=False, default=0, repr=False)
+    undo_stack: List[MoveRecord] = field(init=False, default_factory=list, repr=False)
 
     def __post_init__(self):
         if not all([
@@ -39,84 +51,85 @@ class Board:
         ]):
             raise ValueError("Board dimensions below minimum values")
 
-        cells = tuple(
-            tuple(
-                Cell(
-                    id=id_factory.cell_id(),
-                    coordinate=GridCoordinate(row=row, column=col)
-                )
-                for col in range(self.dimension.length)
-            )
-            for row in range(self.dimension.height)
-        )
-        object.__setattr__(self, 'cells', cells)
+        if self.storage == BoardStorage.DENSE:
+            self.grid = DenseGrid(dimension=self.dimension)
+        else:
+            self.grid = BitboardGrid(dimension=self.dimension)
+
+    @property
+    def cells(self) -> Tuple[Tuple[Cell, ...], ...]:
+        """Every square as a frozen Cell. Builds one object per square, so avoid it on large boards."""
+        return self.grid.cells
+
+    def square_index(self, coordinate: GridCoordinate) -> int:
+        return self.grid.square_index(coordinate)
+
+    def coordinate_at_index(self, index: int) -> GridCoordinate:
+        return self.grid.coordinate_at_index(index)
+
+    def cell_at(self, coordinate: GridCoordinate) -> Cell:
+        return self.grid.cell_at(coordinate.row, coordinate.column)
+
+    def occupant_at(self, coordinate: GridCoordinate) -> Optional[GridEntity]:
+        return self.grid.occupant_at(coordinate.row, coordinate.column)
+
+    def empty_cell_count(self) -> int:
+        return self.grid.empty_count()
+
+    def occupied_cell_count(self) -> int:
+        return self.grid.occupied_count()
+
+    @staticmethod
+    def entity_key(entity: GridEntity) -> int:
+        mover_id = getattr(entity, 'mover_id', None)
+        return mover_id if mover_id is not None else id(entity)
 
     def get_mover_by_id(self, mover_id: int) -> Optional[GridEntity]:
-        for entity in self.entities:
-            print(entity)
-            if entity.id == mover_id:
-                return entity
-        return None
+        return self.entities.get(mover_id)
 
     def get_all_movers(self) -> List[Mover]:
-        movers = []
-        for entity in self.entities:
-            if isinstance(entity, Mover):
-                mover = cast(Mover, entity)
-                if mover not in movers:
-                    movers.append(mover)
-        return self.entities
+        return [cast(Mover, entity) for entity in self.entities.values() if isinstance(entity, Mover)]
 
     def get_empty_cells(self) -> List[Cell]:
-        empty_cells = []
-        for row in self.cells:
-            for cell in row:
-                if cell.occupant is None and cell not in empty_cells:
-                    empty_cells.append(cell)
-        return empty_cells
+        return self.grid.empty_cells()
 
     def get_occupied_cells(self) -> List[Cell]:
-        occupied_cells = []
-        for row in self.cells:
-            for cell in row:
-                if cell.occupant is not None and cell not in occupied_cells:
-                    occupied_cells.append(cell)
-        return occupied_cells
+        return self.grid.occupied_cells()
+
+    def is_area_on_board(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> bool:
+        return (top_left_coordinate.row >= 0 and top_left_coordinate.column >= 0 and
+                top_left_coordinate.row + dimension.height <= self.dimension.height and
+                top_left_coordinate.column + dimension.length <= self.dimension.length)
 
     def get_cells_by_area(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[Cell]:
         if top_left_coordinate is None or dimension is None:
             raise ValueError("Coordinate and dimension must not be None.")
 
-        start_row = top_left_coordinate.row
-        start_col = top_left_coordinate.column
+        return self.grid.area_cells(top_left_coordinate, dimension)
 
-        end_row = start_row + dimension.height - 1
-        end_col = start_col + dimension.length - 1
+    def get_entities_in_area(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[GridEntity]:
+        if top_left_coordinate is None or dimension is None:
+            raise ValueError("Coordinate and dimension must not be None.")
+        return self.grid.area_occupants(top_left_coordinate, dimension)
 
-        cells_in_area = []
-        for r in range(start_row, end_row + 1):
-            for c in range(start_col, end_col + 1):
-                cells_in_area.append(self.cells[r][c])
-        return cells_in_area
+    def get_free_placements(self, entity: GridEntity) -> List[GridCoordinate]:
+        """Every top-left coordinate the entity could occupy, ignoring its own cells."""
+        if entity is None:
+            raise ValueError("Entity must not be None.")
+        return self.grid.free_anchors(entity.dimension, ignore=entity)
 
     def get_cells_occupied_by_entity(self, entity: GridEntity) -> List[Cell]:
         if entity is None:
             return []
-        occupied_cells = []
-        for row in self.cells:
-            for cell in row:
-                if cell.occupant == entity:
-                    occupied_cells.append(cell)
-        return occupied_cells
+        return self.grid.footprint_cells(entity)
 
     def remove_entity_from_cells(self, mover: Mover) -> None:
         if mover is None:
             raise ValueError("Entity not found on the board. cannot remove a non-existent mover.")
 
-        target_cells = self.get_cells_occupied_by_entity(mover)
-        for cell in target_cells:
-            if cell.occupant == mover:
-                cell.occupant = None
+        if self.grid.is_placed(mover):
+            self.zobrist_hash ^= zobrist_key(mover, self.square_index(mover.top_left_coordinate))
+        self.grid.clear(mover)
 
     def add_entity_to_area(self, entity: GridEntity, top_left_coordinate: GridCoordinate) -> None:
 
@@ -129,11 +142,11 @@ class Board:
         if entity is None or top_left_coordinate is None:
             raise ValueError("Entity and top_left_coordinate must not be None.")
 
-        target_cells = self.get_cells_by_area(top_left_coordinate, entity.dimension)
-
-        for cell in target_cells:
-            cell.occupant = entity
+        if self.grid.is_placed(entity):
+            self.remove_entity_from_cells(entity)
+        self.grid.fill(entity, top_left_coordinate)
         entity.top_left_coordinate = top_left_coordinate
+        self.zobrist_hash ^= zobrist_key(entity, self.square_index(top_left_coordinate))
 
     def add_new_entity(self, top_left_coordinate: GridCoordinate, entity: GridEntity) -> Optional[GridEntity]:
         if top_left_coordinate is None or entity is None:
@@ -154,6 +167,34 @@ class Board:
         self.add_entity_to_area(entity, top_left_coordinate)
         return entity
 
+    def add_entities(self, placements: List[Tuple[GridEntity, GridCoordinate]]) -> Optional[List[GridEntity]]:
+        """Place a batch of (entity, top-left coordinate) pairs all together, or none of them."""
+        if placements is None:
+            raise ValueError("Placements must not be None.")
+
+        batch_keys = set()
+        for entity, top_left_coordinate in placements:
+            if top_left_coordinate is None or entity is None:
+                raise ValueError("Top-left top_left_coordinate and mover must not be None.")
+
+            if not self.is_area_on_board(top_left_coordinate, entity.dimension):
+                raise Exception("Entity does not fit within board bounds at the specified top_left_coordinate.")
+
+            key = self.entity_key(entity)
+            registered = self.entities.get(key)
+            if key in batch_keys or (registered is not None and registered is not entity):
+                raise InvalidIdError(f"Another entity is already registered with id {key}.")
+            batch_keys.add(key)
+
+        if not self.grid.are_areas_free(placements):
+            print("Placement batch overlaps itself or entities already on the board. Nothing was placed.")
+            return None
+
+        for entity, top_left_coordinate in placements:
+            self.register_new_entity(entity)
+            self.add_entity_to_area(entity, top_left_coordinate)
+        return [entity for entity, _ in placements]
+
     def move_entity(self, upper_left_destination: GridCoordinate, mover: Mover) -> Optional[Mover]:
         if upper_left_destination is None:
             raise ValueError("Destination top_left_coordinate must not be None.")
@@ -169,58 +210,61 @@ class Board:
         self.add_entity_to_area(mover, upper_left_destination)
         return mover
 
+    def make_move(self, mover: Mover, destination: GridCoordinate) -> Optional[MoveRecord]:
+        """Move without copying or printing, pushing an undo record. Returns None if the cells are not free."""
+        if mover is None or destination is None:
+            raise ValueError("Mover and destination must not be None.")
+        if mover.top_left_coordinate is None or not self.grid.is_placed(mover):
+            raise ValueError("Mover is not placed on the board. Cannot make a move with it.")
+
+        if not self.can_entity_move_to_cells(mover, destination):
+            return None
+
+        record = MoveRecord(mover=mover, origin=mover.top_left_coordinate, destination=destination)
+        self.remove_entity_from_cells(mover)
+        self.add_entity_to_area(mover, destination)
+        self.undo_stack.append(record)
+        return record
+
+    def unmake_move(self, record: Optional[MoveRecord] = None) -> MoveRecord:
+        """Undo the most recent make_move. Records must be unmade in reverse order."""
+        if not self.undo_stack:
+            raise ValueError("No moves to unmake.")
+        if record is not None and self.undo_stack[-1] is not record:
+            raise ValueError("Moves must be unmade in the reverse order they were made.")
+
+        record = self.undo_stack.pop()
+        self.remove_entity_from_cells(record.mover)
+        self.add_entity_to_area(record.mover, record.origin)
+        return record
+
     def remove_entity(self, entity: GridEntity) -> None:
         if entity is None:
             raise ValueError("Entity does not exist. in the board. cannot remove a non-existent mover.")
         self.remove_entity_from_cells(entity)
-        self.entities.remove(entity)
+        key = self.entity_key(entity)
+        if self.entities.get(key) is entity:
+            del self.entities[key]
 
     def can_entity_move_to_cells(self, entity: GridEntity, new_top_left_coordinate: GridCoordinate) -> bool:
         if entity is None or new_top_left_coordinate is None:
             raise ValueError("Entity and coordinate must not be None.")
 
-        if (new_top_left_coordinate.row < 0 or new_top_left_coordinate.column < 0 or
-                new_top_left_coordinate.row + entity.dimension.height > self.dimension.height or
-                new_top_left_coordinate.column + entity.dimension.length > self.dimension.length):
-            return False
-
-        entity_height = entity.dimension.height
-        entity_length = entity.dimension.length
-
-        # Top-left (already have this as new_top_left_coordinate)
-        top = new_top_left_coordinate.row
-        left = new_top_left_coordinate.column
-
-        # Bottom-right
-        bottom = top + entity_height - 1
-        right = left + entity_length - 1
-
-        # Boundary checks (all must be True)
-        if not (0 <= top < self.dimension.height and
-                0 <= left < self.dimension.length and
-                0 <= bottom < self.dimension.height and
-                0 <= right < self.dimension.length):
+        if not self.is_area_on_board(new_top_left_coordinate, entity.dimension):
             return False
 
-        # Collision detection (now using proper boundaries)
-        for r in range(top, bottom + 1):
-            for c in range(left, right + 1):
-                cell = self.cells[r][c]
-                if cell.occupant is not None and cell.occupant != entity:
-                    return False
-        return True
+        return self.grid.is_area_free(new_top_left_coordinate, entity.dimension, ignore=entity)
 
-    def random_empty_cell(self) -> Optional[Cell]:
-        if len(self.get_empty_cells()) == 0:
-            return None
-        cell = random.choice(self.get_empty_cells())
-        while cell is None:
-            cell = random.choice(self.get_empty_cells())
-        return cell
+    def random_empty_cell(self, rng: random.Random = None) -> Optional[Cell]:
+        return self.grid.random_empty_cell(rng)
 
     def register_new_entity(self, entity: GridEntity) -> None:
         if entity is None:
             raise ValueError("Entity must not be None.")
 
-        if entity not in self.entities:
-            self.entities.append(entity)
+        key = self.entity_key(entity)
+        registered = self.entities.get(key)
+        if registered is None:
+            self.entities[key] = entity
+        elif registered is not entity:
+            raise InvalidIdError(f"Another entity is already registered with id {key}.")
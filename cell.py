@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
+
+from geometry import GridCoordinate
+
+if TYPE_CHECKING:
+    from grid_entity import GridEntity
+
+# Boards do not keep Cell objects; grids build these on demand from a square index. They are frozen
+# because they are snapshots: setting an occupant on one could never reach the board.
+@dataclass(frozen=True, slots=True)
+class Cell:
+    id: int
+    coordinate: GridCoordinate
+    occupant: Optional['GridEntity'] = field(default=None)
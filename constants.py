@@ -8,6 +8,10 @@ class PlacementStatus(Enum):
     RELEASED = auto
     INVALID = auto
 
+class BoardStorage(Enum):
+    CELLS = auto()
+    DENSE = auto()
+
 class Config:
     COLUMN_COUNT: int = 21
     ROW_COUNT: int = 21
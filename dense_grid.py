@@ -0,0 +1,193 @@
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for BoardStorage.DENSE
+    np = None
+
+from cell import Cell
+from geometry import Dimension, GridCoordinate, Direction
+from grid_entity import GridEntity
+from move_tables import MoveTables
+from occupancy_grid import OccupancyGrid
+
+
+@dataclass
+class DenseGrid(OccupancyGrid):
+    """Occupancy kept as an int32 array of entity handles, 0 meaning empty.
+
+    No Cell objects are stored; the Cell values this grid returns are built on
+    demand and writing to their occupant does not change the board.
+
+    A summed-area table of occupied squares is rebuilt lazily by batch queries
+    and answers rectangle counts in O(1) until the next fill or clear.
+    """
+    RANDOM_PROBES = 16
+
+    dimension: Dimension
+
+    handles: 'np.ndarray' = field(init=False, repr=False)
+    # Handle 0 is reserved for empty squares.
+    entity_handles: Dict[GridEntity, int] = field(init=False, default_factory=dict, repr=False)
+    handle_entities: List[Optional[GridEntity]] = field(init=False, default_factory=lambda: [None], repr=False)
+    footprints: Dict[GridEntity, Tuple[slice, slice]] = field(init=False, default_factory=dict, repr=False)
+    occupied: int = field(init=False, default=0, repr=False)
+    summed_area: Optional['np.ndarray'] = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        if np is None:
+            raise ImportError("BoardStorage.DENSE requires numpy to be installed.")
+        self.handles = np.zeros((self.dimension.height, self.dimension.length), dtype=np.int32)
+
+    @staticmethod
+    def area_slices(top_left_coordinate: GridCoordinate, dimension: Dimension) -> Tuple[slice, slice]:
+        return (
+            slice(top_left_coordinate.row, top_left_coordinate.row + dimension.height),
+            slice(top_left_coordinate.column, top_left_coordinate.column + dimension.length)
+        )
+
+    @staticmethod
+    def build_summed_area(occupied: 'np.ndarray') -> 'np.ndarray':
+        table = np.zeros((occupied.shape[0] + 1, occupied.shape[1] + 1), dtype=np.int64)
+        np.cumsum(np.cumsum(occupied, axis=0), axis=1, out=table[1:, 1:])
+        return table
+
+    def current_summed_area(self) -> 'np.ndarray':
+        if self.summed_area is None:
+            self.summed_area = self.build_summed_area(self.handles != 0)
+        return self.summed_area
+
+    def occupied_in_area(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> int:
+        table = self.current_summed_area()
+        top, left = top_left_coordinate.row, top_left_coordinate.column
+        bottom, right = top + dimension.height, left + dimension.length
+        return int(table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left])
+
+    def handle_of(self, entity: GridEntity) -> int:
+        handle = self.entity_handles.get(entity)
+        if handle is None:
+            handle = len(self.handle_entities)
+            self.entity_handles[entity] = handle
+            self.handle_entities.append(entity)
+        return handle
+
+    def make_cells(self, positions: 'np.ndarray', row_offset: int = 0, column_offset: int = 0) -> List[Cell]:
+        return [self.cell_at(int(row) + row_offset, int(column) + column_offset) for row, column in positions]
+
+    def occupant_at(self, row: int, column: int) -> Optional[GridEntity]:
+        return self.handle_entities[self.handles[row, column]]
+
+    def is_area_free(self, top_left_coordinate: GridCoordinate, dimension: Dimension,
+                     ignore: Optional[GridEntity] = None) -> bool:
+        ignored_area = self.footprints.get(ignore) if ignore is not None else None
+        if self.summed_area is not None:
+            blocked = self.occupied_in_area(top_left_coordinate, dimension)
+            if ignored_area is not None:
+                rows, columns = self.area_slices(top_left_coordinate, dimension)
+                overlap_rows = min(rows.stop, ignored_area[0].stop) - max(rows.start, ignored_area[0].start)
+                overlap_columns = min(columns.stop, ignored_area[1].stop) - max(columns.start, ignored_area[1].start)
+                if overlap_rows > 0 and overlap_columns > 0:
+                    blocked -= overlap_rows * overlap_columns
+            return blocked == 0
+
+        # The table is stale after a write; a slice check beats rebuilding it for one query.
+        region = self.handles[self.area_slices(top_left_coordinate, dimension)]
+        if ignored_area is None:
+            return not region.any()
+        return not ((region != 0) & (region != self.entity_handles[ignore])).any()
+
+    def free_anchors(self, dimension: Dimension, ignore: Optional[GridEntity] = None) -> List[GridCoordinate]:
+        if dimension.height > self.dimension.height or dimension.length > self.dimension.length:
+            return []
+        if ignore is not None and ignore in self.footprints:
+            table = self.build_summed_area((self.handles != 0) & (self.handles != self.entity_handles[ignore]))
+        else:
+            table = self.current_summed_area()
+
+        height, length = dimension.height, dimension.length
+        last_row, last_column = table.shape[0] - height, table.shape[1] - length
+        counts = (table[height:, length:] - table[:last_row, length:]
+                  - table[height:, :last_column] + table[:last_row, :last_column])
+        return [GridCoordinate(row=int(row), column=int(column)) for row, column in np.argwhere(counts == 0)]
+
+    def is_placed(self, entity: GridEntity) -> bool:
+        return entity in self.footprints
+
+    def fill(self, entity: GridEntity, top_left_coordinate: GridCoordinate) -> None:
+        if entity in self.footprints:
+            self.clear(entity)
+
+        area = self.area_slices(top_left_coordinate, entity.dimension)
+        region = self.handles[area]
+        self.occupied += int(np.count_nonzero(region == 0))
+        region[...] = self.handle_of(entity)
+        self.footprints[entity] = area
+        self.summed_area = None
+
+    def clear(self, entity: GridEntity) -> None:
+        area = self.footprints.pop(entity, None)
+        if area is None:
+            return
+        region = self.handles[area]
+        owned = region == self.entity_handles[entity]
+        self.occupied -= int(np.count_nonzero(owned))
+        region[owned] = 0
+        self.summed_area = None
+
+    def footprint_cells(self, entity: GridEntity) -> List[Cell]:
+        area = self.footprints.get(entity)
+        if area is None:
+            return []
+        owned = np.argwhere(self.handles[area] == self.entity_handles[entity])
+        return self.make_cells(owned, area[0].start, area[1].start)
+
+    def area_cells(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[Cell]:
+        return [
+            self.cell_at(row, column)
+            for row in range(top_left_coordinate.row, top_left_coordinate.row + dimension.height)
+            for column in range(top_left_coordinate.column, top_left_coordinate.column + dimension.length)
+        ]
+
+    def area_occupants(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[GridEntity]:
+        region = self.handles[self.area_slices(top_left_coordinate, dimension)]
+        return [self.handle_entities[handle] for handle in np.unique(region[region != 0])]
+
+    def empty_cells(self) -> List[Cell]:
+        return self.make_cells(np.argwhere(self.handles == 0))
+
+    def occupied_cells(self) -> List[Cell]:
+        return self.make_cells(np.argwhere(self.handles != 0))
+
+    def empty_count(self) -> int:
+        return self.dimension.area() - self.occupied
+
+    def ray_reach(self, tables: MoveTables, direction: Direction, origin: int) -> Tuple[int, ...]:
+        ray = tables.ray(direction, origin)
+        if not ray:
+            return ray
+        # A ray's squares are evenly spaced in the flat handle array, so the whole ray is one strided view.
+        step = ray[0] - origin
+        stop = ray[-1] + (1 if step > 0 else -1)
+        squares = self.handles.ravel()[ray[0]:stop if stop >= 0 else None:step]
+        blockers = np.flatnonzero(squares)[:1]
+        return ray[:int(blockers[0])] if len(blockers) else ray
+
+    def occupancy_mask(self) -> int:
+        packed = np.packbits(self.handles.ravel() != 0, bitorder='little')
+        return int.from_bytes(packed.tobytes(), 'little')
+
+    def random_empty_cell(self, rng: random.Random = None) -> Optional[Cell]:
+        if self.empty_count() == 0:
+            return None
+        chooser = rng if rng is not None else random
+        # Probing is cheap while the board is mostly empty; fall back to a full scan when it is not.
+        for _ in range(self.RANDOM_PROBES):
+            row = chooser.randrange(self.dimension.height)
+            column = chooser.randrange(self.dimension.length)
+            if self.handles[row, column] == 0:
+                return self.cell_at(row, column)
+        empty = np.flatnonzero(self.handles == 0)
+        row, column = divmod(int(empty[chooser.randrange(len(empty))]), self.dimension.length)
+        return self.cell_at(row, column)
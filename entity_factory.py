@@ -2,8 +2,8 @@ import random
 from typing import List
 
 from board import Board
-from grid_entity import HorizontalMover, VerticalMover
-from geometry import Dimension
+from grid_entity import Mover, HorizontalMover, VerticalMover, Castle, Knight, Bishop
+from geometry import Dimension, GridCoordinate
 from id_factory import id_factory
 
 
@@ -23,7 +23,6 @@ class EntityFactory:
             height=random.randint(1, max_height),
             top_left_coordinate=None
         )
-        print(mover)
         return mover
 
     @staticmethod
@@ -31,28 +30,70 @@ class EntityFactory:
         return [EntityFactory.build_horizontal_mover(max_height) for _ in range(count)]
 
     @staticmethod
-    def build_vertical_mover(max_length: int) -> HorizontalMover:
+    def build_vertical_mover(max_length: int) -> VerticalMover:
         mover = VerticalMover(
             mover_id=id_factory.mover_id(),
             length=random.randint(1, max_length),
             top_left_coordinate=None
         )
-        print(mover)
         return mover
 
     @staticmethod
-    def build_vertical_mover_list(max_length: int, count: int) -> List[HorizontalMover]:
+    def build_vertical_mover_list(max_length: int, count: int) -> List[VerticalMover]:
         return [EntityFactory.build_vertical_mover(max_length) for _ in range(count)]
 
 
+    @staticmethod
+    def build_chess_board() -> Board:
+        """The 8x8 layout run_game opens with."""
+        board = Board(dimension=Dimension(length=8, height=8))
+        board.add_entities([
+            (Castle(mover_id=id_factory.mover_id()), GridCoordinate(7,0)),
+            (Castle(mover_id=id_factory.mover_id()), GridCoordinate(7,7)),
+
+            (Knight(mover_id=id_factory.mover_id()), GridCoordinate(7,1)),
+            (Knight(mover_id=id_factory.mover_id()), GridCoordinate(7,6)),
+
+            (Knight(mover_id=id_factory.mover_id()), GridCoordinate(0,1)),
+            (Knight(mover_id=id_factory.mover_id()), GridCoordinate(0,6)),
+
+            (Castle(mover_id=id_factory.mover_id()), GridCoordinate(1,0)),
+            (Castle(mover_id=id_factory.mover_id()), GridCoordinate(1,7)),
+
+            (Bishop(mover_id=id_factory.mover_id()), GridCoordinate(7, 2)),
+            (Bishop(mover_id=id_factory.mover_id()), GridCoordinate(7, 5)),
+
+            (Bishop(mover_id=id_factory.mover_id()), GridCoordinate(0, 2)),
+            (Bishop(mover_id=id_factory.mover_id()), GridCoordinate(0, 5)),
+        ])
+        return board
+
     @staticmethod
     def build_board(
             dimension=Dimension(21, 21),
             max_entity_dimension: int = 7,
             max_entities: int = 10
     ) -> 'Board':
-        board = Board()
-        board.add_horizontal_mover(EntityFactory.horizontal_mover(max_height=max_entity_dimension))
+        """Board of the given size with up to max_entities random movers dropped onto free cells."""
+        board = Board(dimension=dimension)
+        horizontal_count = max_entities // 2
+        movers = (
+            EntityFactory.build_horizontal_mover_list(max_entity_dimension, horizontal_count) +
+            EntityFactory.build_vertical_mover_list(max_entity_dimension, max_entities - horizontal_count)
+        )
+        for mover in movers:
+            EntityFactory.place_randomly(board, mover)
         return board
 
+    @staticmethod
+    def place_randomly(board: Board, mover: Mover, attempts: int = 20, rng: random.Random = None) -> bool:
+        """Drop the mover on a random empty cell where it fits. False if no attempt fit."""
+        for _ in range(attempts):
+            cell = board.random_empty_cell(rng)
+            if cell is None:
+                return False
+            if board.can_entity_move_to_cells(mover, cell.coordinate):
+                return board.add_new_entity(cell.coordinate, mover) is not None
+        return False
+
 
@@ -68,3 +68,7 @@ class NegativeRowError(GameError):
 class NegativeColumnError(GameError):
     """Cell cannot be on a negative column."""
     pass
+
+class StateLimitExceededError(GameError):
+    """Raised when a puzzle search explores more states than it was allowed to"""
+    pass
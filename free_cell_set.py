@@ -0,0 +1,59 @@
+import random
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+
+@dataclass
+class FreeCellSet:
+    """Square indices of empty cells with O(1) add, discard and uniform sampling.
+
+    Removal swaps the last index into the vacated slot, so `positions[index]`
+    always points at the index's slot in `squares`, or is -1 when the square is
+    not free. Both are flat int arrays, 16 bytes per board square in total.
+    """
+    size: int
+    squares: array = field(init=False, repr=False)
+    positions: array = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.squares = array('q')
+        self.positions = array('q', [-1]) * self.size
+
+    @classmethod
+    def full(cls, size: int) -> 'FreeCellSet':
+        free_cells = cls(size=size)
+        free_cells.squares = array('q', range(size))
+        free_cells.positions = array('q', range(size))
+        return free_cells
+
+    def add(self, index: int) -> None:
+        if self.positions[index] >= 0:
+            return
+        self.positions[index] = len(self.squares)
+        self.squares.append(index)
+
+    def discard(self, index: int) -> None:
+        position = self.positions[index]
+        if position < 0:
+            return
+        self.positions[index] = -1
+        last = self.squares.pop()
+        if position < len(self.squares):
+            self.squares[position] = last
+            self.positions[last] = position
+
+    def sample(self, rng: random.Random = None) -> Optional[int]:
+        if not self.squares:
+            return None
+        chooser = rng if rng is not None else random
+        return self.squares[chooser.randrange(len(self.squares))]
+
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < self.size and self.positions[index] >= 0
+
+    def __len__(self) -> int:
+        return len(self.squares)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.squares)
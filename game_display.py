@@ -1,17 +1,30 @@
 from dataclasses import dataclass, field
 
 import pygame
-from typing import TYPE_CHECKING, Optional, cast, OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, cast, OrderedDict
 
 from colorama.ansi import clear_line
 
 from constants import GameColor, PlacementStatus
-from geometry import GridCoordinate
-from grid_entity import GridEntity, Mover, HorizontalMover, VerticalMover, Bishop, Knight, Castle
+from bitmask import mask_flags
+from geometry import Dimension, GridCoordinate
+from grid_entity import GridEntity, Mover, HorizontalMover, VerticalMover, Bishop, Knight, Castle, BrikPallet
 
 if TYPE_CHECKING:
     from board import Board
 
+# Fill color per piece type; other entities only get their id label.
+PIECE_COLORS = {
+    Castle: GameColor.OLIVE.value,
+    Knight: GameColor.DEEP_ORANGE.value,
+    Bishop: GameColor.IVORY.value,
+    BrikPallet: GameColor.DARKER_SAND.value,
+}
+# Stands in for the entity type in the sprite key of the block drawn for a dragged mover.
+DRAG_SPRITE = 'drag'
+# mask_flags characters to palette indices of the coarse-zoom occupancy image.
+OCCUPANCY_PALETTE_INDEX = bytes.maketrans(b'01', b'\x00\x01')
+
 @dataclass(frozen=True)
 class DragState:
     mover: Mover
@@ -19,6 +32,10 @@ class DragState:
     current_coordinate: GridCoordinate
     offset_x: int = 0
     offset_y: int = 0
+    # Squares the mover may be dropped on, computed once at drag start: bit (row * length + column)
+    # in legal_mask, and the same flags as a '0'/'1' string in legal_squares for per-motion lookups.
+    legal_mask: int = 0
+    legal_squares: str = ''
 
     def with_updated_position(self, new_coordinate: GridCoordinate) -> 'DragState':
         return DragState(
@@ -26,97 +43,241 @@ class DragState:
             original_coordinate=self.original_coordinate,
             current_coordinate=new_coordinate,
             offset_x=self.offset_x,
-            offset_y=self.offset_y
+            offset_y=self.offset_y,
+            legal_mask=self.legal_mask,
+            legal_squares=self.legal_squares
         )
 
 @dataclass
 class GameDisplay:
+    # Zoom limits on cell_px. Below LOD_CELL_PX the board is drawn from the occupancy image
+    # instead of per-cell squares and sprites, and below LABEL_CELL_PX ids are not drawn.
+    MIN_CELL_PX = 1
+    MAX_CELL_PX = 120
+    LOD_CELL_PX = 8
+    LABEL_CELL_PX = 16
+    ZOOM_STEP = 1.25
+    PAN_STEP_CELLS = 4
+
     board: 'Board'
+    # Current zoom: on-screen size of one cell.
     cell_px: int = 60
     border_px: int = 2
     screen_width: int = 800
     screen_height: int = 800
+    # The window never grows past this; bigger boards are panned.
+    max_screen_width: int = 1280
+    max_screen_height: int = 960
+
+    # Screen pixel (0, 0) shows board pixel (camera_x, camera_y) at the current cell_px.
+    camera_x: int = field(default=0, init=False)
+    camera_y: int = field(default=0, init=False)
+    # Last pointer position of a right- or middle-button pan, None when not panning.
+    pan_anchor: Optional[Tuple[int, int]] = field(default=None, init=False, repr=False)
 
     active_drags: OrderedDict[int, DragState] = field(default_factory=OrderedDict)
     is_dragging: bool = False
+    # Spatial index of active drags: square index -> mover_id of the drag currently covering it.
+    drag_cells: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+
+    # The checkerboard, rendered once and blitted back under anything that moves.
+    background: Optional[pygame.Surface] = field(default=None, init=False, repr=False)
+    # What the last frame put on screen: (is a drag, entity key) -> (area, entity or DragState), in draw order.
+    drawn_scene: Dict[Tuple[bool, int], Tuple[pygame.Rect, object]] = field(default_factory=dict, init=False, repr=False)
+    needs_full_redraw: bool = field(default=True, init=False)
+    # Pre-rendered pieces keyed by (type, dimension, cell_px, color) and id labels keyed by (text, cell_px).
+    sprite_cache: Dict[Tuple[object, Dimension, int, tuple], pygame.Surface] = field(
+        default_factory=dict, init=False, repr=False)
+    glyph_cache: Dict[Tuple[str, int], pygame.Surface] = field(default_factory=dict, init=False, repr=False)
+    fonts: Dict[int, pygame.font.Font] = field(default_factory=dict, init=False, repr=False)
+    # One pixel per cell, occupied or not, for the coarse zoom levels; rebuilt when the zobrist hash changes.
+    occupancy_image: Optional[pygame.Surface] = field(default=None, init=False, repr=False)
+    occupancy_image_hash: Optional[int] = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
-        self.screen_width = self.board.dimension.length * self.cell_px + self.border_px * 2
-        self.screen_height = self.board.dimension.height * self.cell_px + self.border_px * 2
+        self.screen_width = min(self.board_width_px(), self.max_screen_width)
+        self.screen_height = min(self.board_height_px(), self.max_screen_height)
 
         pygame.init()
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("Chess")
-        self.font = pygame.font.SysFont("monospace", 30)
-
-    def draw_grid(self):
+        self.background = self.build_background()
+
+    def board_width_px(self) -> int:
+        return self.board.dimension.length * self.cell_px + self.border_px * 2
+
+    def board_height_px(self) -> int:
+        return self.board.dimension.height * self.cell_px + self.border_px * 2
+
+    @property
+    def font(self) -> pygame.font.Font:
+        """Label font for the current zoom; 30pt at the default 60px cells."""
+        size = max(8, self.cell_px // 2)
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.SysFont("monospace", size)
+            self.fonts[size] = font
+        return font
+
+    def visible_cells(self) -> Tuple[int, int, int, int]:
+        """(first row, first column, row count, column count) of the cells at least partly on screen."""
+        first_row = max(0, (self.camera_y - self.border_px) // self.cell_px)
+        first_column = max(0, (self.camera_x - self.border_px) // self.cell_px)
+        last_row = min(self.board.dimension.height - 1,
+                       (self.camera_y + self.screen_height - self.border_px) // self.cell_px)
+        last_column = min(self.board.dimension.length - 1,
+                          (self.camera_x + self.screen_width - self.border_px) // self.cell_px)
+        return first_row, first_column, last_row - first_row + 1, last_column - first_column + 1
+
+    def build_background(self) -> pygame.Surface:
+        """The checkerboard under the current camera, tiled from one 2x2-cell block so only visible cells cost."""
+        background = pygame.Surface((self.screen_width, self.screen_height))
         screen_color = GameColor.DARK_GRAY_1.value
-        self.screen.fill(screen_color)
+        background.fill(screen_color)
+        if self.cell_px < self.LOD_CELL_PX:
+            return background
 
         cell_color = GameColor.LIGHT_SAND.value
         opposite_cell_color = screen_color
-
-        current_cell_color = cell_color
-        previous_cell_color = cell_color
-        for row in range(self.board.dimension.height):
-            for col in range(self.board.dimension.length):
-                cell_rect = pygame.Rect(
-                    col * self.cell_px + self.border_px,
-                    row * self.cell_px + self.border_px,
-                    self.cell_px,
-                    self.cell_px
-                )
-
-                cell = self.board.cells[row][col]
+        tile = pygame.Surface((self.cell_px * 2, self.cell_px * 2))
+        for row in range(2):
+            for col in range(2):
+                cell_rect = pygame.Rect(col * self.cell_px, row * self.cell_px, self.cell_px, self.cell_px)
                 current_cell_color = cell_color if (row + col) % 2 == 0 else opposite_cell_color
-
-                pygame.draw.rect(self.screen, current_cell_color, cell_rect)
+                pygame.draw.rect(tile, current_cell_color, cell_rect)
                 # Draw an outlined rectangle
-                pygame.draw.rect(self.screen, GameColor.BLACK.value, cell_rect, 1)
+                pygame.draw.rect(tile, GameColor.BLACK.value, cell_rect, 1)
+
+        first_row, first_column, row_count, column_count = self.visible_cells()
+        # Tiles start on an even cell so the colors keep their (row + column) parity.
+        first_row -= first_row % 2
+        first_column -= first_column % 2
+        background.set_clip(pygame.Rect(self.border_px - self.camera_x, self.border_px - self.camera_y,
+                                        self.board.dimension.length * self.cell_px,
+                                        self.board.dimension.height * self.cell_px))
+        background.blits([
+            (tile, (col * self.cell_px + self.border_px - self.camera_x,
+                    row * self.cell_px + self.border_px - self.camera_y))
+            for row in range(first_row, first_row + row_count + 1, 2)
+            for col in range(first_column, first_column + column_count + 1, 2)
+        ], doreturn=False)
+        background.set_clip(None)
+        return background
 
-    def draw_all_entities(self):
-        # First draw board entities
-        for entity in self.board.entities:
-            self.draw_entity(entity)
-
-        # Then draw any entities being dragged at their current position
-        for drag_state in self.active_drags.values():
-            rect = pygame.Rect(
-                drag_state.current_coordinate.column * self.cell_px + self.border_px,
-                drag_state.current_coordinate.row * self.cell_px + self.border_px,
-                drag_state.mover.dimension.length * self.cell_px - self.border_px,
-                drag_state.mover.dimension.height * self.cell_px - self.border_px
-            )
-            pygame.draw.rect(self.screen, GameColor.OLIVE.value, rect)
-            text_surface = self.font.render(str(drag_state.mover.mover_id), True, GameColor.BLACK.value)
-            text_rect = text_surface.get_rect(center=rect.center)
-            self.screen.blit(text_surface, text_rect)
+    def draw_grid(self):
+        self.screen.blit(self.background, (0, 0))
+
+    def area_rect(self, coordinate: GridCoordinate, dimension) -> pygame.Rect:
+        """Screen rect of the cells an area covers; everything drawn for an entity stays inside it."""
+        return pygame.Rect(
+            coordinate.column * self.cell_px + self.border_px - self.camera_x,
+            coordinate.row * self.cell_px + self.border_px - self.camera_y,
+            dimension.length * self.cell_px,
+            dimension.height * self.cell_px
+        )
 
-    def draw_entity(self, entity: 'GridEntity'):
-        """Draw a single mover on the board"""
-        if entity is None:
-            print("[Warning] Entity cannot be None. Cannot draw a null mover to the screen.")
+    def draw_all_entities(self):
+        blit_items = []
+        # First board entities, then any entities being dragged at their current position; off-screen ones are culled
+        for (is_drag, _), (_, item) in self.current_scene().items():
+            blit_items += self.drag_blits(item) if is_drag else self.entity_blits(item)
+        self.screen.blits(blit_items, doreturn=False)
+
+    def set_camera(self, camera_x: int, camera_y: int) -> None:
+        """Move the view, kept inside the board, and schedule a full repaint if it moved."""
+        camera_x = max(0, min(camera_x, self.board_width_px() - self.screen_width))
+        camera_y = max(0, min(camera_y, self.board_height_px() - self.screen_height))
+        if (camera_x, camera_y) == (self.camera_x, self.camera_y):
             return
-        if entity.top_left_coordinate is None:
-            print("[Warning] Entity has no top_left_coordinate. Cannot draw an mover without a top_left_coordinate to the screen.")
+        self.camera_x, self.camera_y = camera_x, camera_y
+        self.background = self.build_background()
+        self.invalidate()
+
+    def pan(self, delta_x: int, delta_y: int) -> None:
+        self.set_camera(self.camera_x + delta_x, self.camera_y + delta_y)
+
+    def zoom_at(self, cell_px: int, anchor: Tuple[int, int]) -> None:
+        """Zoom to the given cell size, keeping the board point under the anchor screen position in place."""
+        cell_px = max(self.MIN_CELL_PX, min(cell_px, self.MAX_CELL_PX))
+        if cell_px == self.cell_px or self.active_drags:
             return
+        world_x = (anchor[0] + self.camera_x) / self.cell_px
+        world_y = (anchor[1] + self.camera_y) / self.cell_px
+        self.cell_px = cell_px
+        # Force set_camera to rebuild even if the clamped camera lands where it was.
+        self.camera_x = self.camera_y = -1
+        self.set_camera(round(world_x * cell_px - anchor[0]), round(world_y * cell_px - anchor[1]))
+
+    def zoom_steps(self, steps: int, anchor: Tuple[int, int]) -> None:
+        cell_px = round(self.cell_px * self.ZOOM_STEP ** steps)
+        if cell_px == self.cell_px:
+            cell_px += 1 if steps > 0 else -1
+        self.zoom_at(cell_px, anchor)
+
+    def handle_mouse_wheel(self, event: pygame.event.Event):
+        if event.y:
+            self.zoom_steps(event.y, pygame.mouse.get_pos())
+
+    def handle_key_down(self, event: pygame.event.Event):
+        step = self.cell_px * self.PAN_STEP_CELLS
+        center = (self.screen_width // 2, self.screen_height // 2)
+        if event.key == pygame.K_LEFT:
+            self.pan(-step, 0)
+        elif event.key == pygame.K_RIGHT:
+            self.pan(step, 0)
+        elif event.key == pygame.K_UP:
+            self.pan(0, -step)
+        elif event.key == pygame.K_DOWN:
+            self.pan(0, step)
+        elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self.zoom_steps(1, center)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.zoom_steps(-1, center)
+
+    def world_position(self, mouse_position: tuple) -> Tuple[int, int]:
+        """Board pixel under a screen position at the current zoom."""
+        return mouse_position[0] + self.camera_x, mouse_position[1] + self.camera_y
+
+    def build_occupancy_image(self) -> pygame.Surface:
+        area = self.board.dimension.area()
+        pixels = mask_flags(self.board.grid.occupancy_mask(), area).encode().translate(OCCUPANCY_PALETTE_INDEX)
+        image = pygame.image.frombytes(pixels, (self.board.dimension.length, self.board.dimension.height), 'P')
+        image.set_palette([GameColor.LIGHT_SAND.value, GameColor.OLIVE.value])
+        return image
+
+    def update_coarse_display(self) -> bool:
+        """Far-zoom frame: the visible part of the one-pixel-per-cell occupancy image scaled up to cell_px."""
+        if not self.needs_full_redraw and self.occupancy_image_hash == self.board.zobrist_hash:
+            return False
+        if self.occupancy_image is None or self.occupancy_image_hash != self.board.zobrist_hash:
+            self.occupancy_image = self.build_occupancy_image()
+            self.occupancy_image_hash = self.board.zobrist_hash
 
-        bishop_color = GameColor.IVORY.value
-        castle_color = GameColor.OLIVE.value
-        knight_color = GameColor.DEEP_ORANGE.value
-        # print(f"Drawing mover {mover.mover_id_counter} at top_left_coordinate {mover.top_left_coordinate}")
-        # Calculate position and dimensions
-        rect = pygame.Rect(
-            entity.top_left_coordinate.column * self.cell_px + self.border_px,
-            entity.top_left_coordinate.row * self.cell_px + self.border_px,
-            entity.dimension.length * self.cell_px - self.border_px,
-            entity.dimension.height * self.cell_px - self.border_px
-        )
-        # Draw the mover (fixed the width parameter)
+        self.draw_grid()
+        first_row, first_column, row_count, column_count = self.visible_cells()
+        if row_count > 0 and column_count > 0:
+            visible = self.occupancy_image.subsurface(pygame.Rect(first_column, first_row, column_count, row_count))
+            scaled = pygame.transform.scale(visible, (column_count * self.cell_px, row_count * self.cell_px))
+            self.screen.blit(scaled, (first_column * self.cell_px + self.border_px - self.camera_x,
+                                      first_row * self.cell_px + self.border_px - self.camera_y))
+        pygame.display.flip()
+        self.drawn_scene = {}
+        self.needs_full_redraw = False
+        return True
 
-        if isinstance(entity, Castle):
-            pygame.draw.rect(self.screen, castle_color, rect)
-        if isinstance(entity, Knight):
+    def sprite(self, sprite_type: object, dimension: Dimension, color: tuple) -> pygame.Surface:
+        key = (sprite_type, dimension, self.cell_px, color)
+        surface = self.sprite_cache.get(key)
+        if surface is None:
+            surface = self.render_sprite(sprite_type, dimension, color)
+            self.sprite_cache[key] = surface
+        return surface
+
+    def render_sprite(self, sprite_type: object, dimension: Dimension, color: tuple) -> pygame.Surface:
+        rect = pygame.Rect(0, 0, dimension.length * self.cell_px - self.border_px,
+                           dimension.height * self.cell_px - self.border_px)
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        if sprite_type is Knight:
             center_x, center_y = rect.center
             radius = min(rect.width, rect.height) // 2 - 2  # slightly smaller than cell
 
@@ -126,19 +287,61 @@ class GameDisplay:
                 (center_x - radius * 0.866, center_y + radius // 2),  # bottom left
                 (center_x + radius * 0.866, center_y + radius // 2)  # bottom right
             ]
-            pygame.draw.polygon(self.screen, knight_color, triangle_points)
-        if isinstance(entity, Bishop):
-            pygame.draw.circle(
-                self.screen,
-                bishop_color,
-                rect.center,
-                min(rect.width, rect.height) // 2 - 2  # slightly smaller than cell
-            )
-
-        # Draw mover ID
-        text_surface = self.font.render(str(entity.mover_id), True, GameColor.BLACK.value)
-        text_rect = text_surface.get_rect(center=rect.center)
-        self.screen.blit(text_surface, text_rect)
+            pygame.draw.polygon(surface, color, triangle_points)
+        elif sprite_type is Bishop:
+            pygame.draw.circle(surface, color, rect.center, min(rect.width, rect.height) // 2 - 2)
+        else:
+            pygame.draw.rect(surface, color, rect)
+        return surface
+
+    def glyph(self, text: str) -> pygame.Surface:
+        key = (text, self.cell_px)
+        surface = self.glyph_cache.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, GameColor.BLACK.value)
+            self.glyph_cache[key] = surface
+        return surface
+
+    def labelled_blits(self, sprite: Optional[pygame.Surface], coordinate: GridCoordinate, dimension: Dimension,
+                       label: Optional[str]) -> List[Tuple[pygame.Surface, tuple]]:
+        rect = pygame.Rect(
+            coordinate.column * self.cell_px + self.border_px - self.camera_x,
+            coordinate.row * self.cell_px + self.border_px - self.camera_y,
+            dimension.length * self.cell_px - self.border_px,
+            dimension.height * self.cell_px - self.border_px
+        )
+        items = [(sprite, rect.topleft)] if sprite is not None else []
+        if label is not None and self.cell_px >= self.LABEL_CELL_PX:
+            glyph = self.glyph(label)
+            items.append((glyph, glyph.get_rect(center=rect.center).topleft))
+        return items
+
+    def drag_blits(self, drag_state: DragState) -> List[Tuple[pygame.Surface, tuple]]:
+        mover = drag_state.mover
+        sprite = self.sprite(DRAG_SPRITE, mover.dimension, GameColor.OLIVE.value)
+        return self.labelled_blits(sprite, drag_state.current_coordinate, mover.dimension, str(mover.mover_id))
+
+    def entity_blits(self, entity: 'GridEntity') -> List[Tuple[pygame.Surface, tuple]]:
+        if entity.top_left_coordinate is None:
+            return []
+        color = PIECE_COLORS.get(type(entity))
+        sprite = self.sprite(type(entity), entity.dimension, color) if color is not None else None
+        # BrikPallets have no id to show.
+        label = str(entity.mover_id) if isinstance(entity, Mover) else None
+        return self.labelled_blits(sprite, entity.top_left_coordinate, entity.dimension, label)
+
+    def draw_drag(self, drag_state: DragState):
+        self.screen.blits(self.drag_blits(drag_state), doreturn=False)
+
+    def draw_entity(self, entity: 'GridEntity'):
+        """Draw a single mover on the board"""
+        if entity is None:
+            print("[Warning] Entity cannot be None. Cannot draw a null mover to the screen.")
+            return
+        if entity.top_left_coordinate is None:
+            print("[Warning] Entity has no top_left_coordinate. Cannot draw an mover without a top_left_coordinate to the screen.")
+            return
+        self.screen.blits(self.entity_blits(entity), doreturn=False)
 
     def get_entity_at_mouse_position(self, mouse_position: tuple) -> Optional['GridEntity']:
         if mouse_position is None:
@@ -148,20 +351,29 @@ class GameDisplay:
         if coordinate is None:
             print("Mouse is outside the game board. Cannot get an mover at a position outside the board.")
             return None
-        return self.board.cells[coordinate.row][coordinate.column].occupant
+        return self.board.occupant_at(coordinate)
 
     def handle_mouse_down(self, event: pygame.event.Event):
-        if event.button == 1:  # Left mouse button
+        if event.button == 1 and self.cell_px >= self.LOD_CELL_PX:  # Left mouse button; too small to drag below LOD
             entity = self.get_entity_at_mouse_position(event.pos)
-            if entity is not None:
+            if isinstance(entity, Mover):
                 self.start_drag(entity, event.pos)
+            elif entity is not None:
+                print(f"[Warning] {type(entity).__name__} is not a mover. Cannot drag it.")
+        elif event.button in (2, 3):
+            self.pan_anchor = event.pos
 
     def handle_mouse_motion(self, event: pygame.event.Event):
+        if self.pan_anchor is not None:
+            self.pan(self.pan_anchor[0] - event.pos[0], self.pan_anchor[1] - event.pos[1])
+            self.pan_anchor = event.pos
         if self.is_dragging and self.active_drags:
             mover_id = list(self.active_drags.keys())[0]
             self.update_drag(mover_id, event.pos)
 
     def handle_mouse_up(self, event: pygame.event.Event) -> PlacementStatus | None:
+        if event.button in (2, 3):
+            self.pan_anchor = None
         if event.button == 1 and self.is_dragging and self.active_drags:
             mover_id = list(self.active_drags.keys())[0]
             placement_status = self.end_drag(mover_id)
@@ -170,13 +382,19 @@ class GameDisplay:
         return PlacementStatus.RELEASED
 
     def start_drag(self, mover: Mover, mouse_position: tuple[int, int]) -> None:
+        # Dropping back where it started is always allowed.
+        legal_mask = mover.movement_strategy.legal_destination_mask(mover, self.board)
+        legal_mask |= 1 << self.board.square_index(mover.top_left_coordinate)
         self.active_drags[mover.mover_id] = DragState(
             mover=mover,
             original_coordinate=mover.top_left_coordinate,
             current_coordinate=mover.top_left_coordinate,
-            offset_x=mouse_position[0] - (mover.top_left_coordinate.column * self.cell_px),
-            offset_y=mouse_position[1] - (mover.top_left_coordinate.row * self.cell_px)
+            offset_x=self.world_position(mouse_position)[0] - (mover.top_left_coordinate.column * self.cell_px),
+            offset_y=self.world_position(mouse_position)[1] - (mover.top_left_coordinate.row * self.cell_px),
+            legal_mask=legal_mask,
+            legal_squares=mask_flags(legal_mask, self.board.dimension.area())
         )
+        self.claim_drag_cells(mover.mover_id, mover.top_left_coordinate, mover.dimension)
         self.is_dragging = True
         print("mover", mover.mover_id, "dragging started at", self.active_drags[mover.mover_id].original_coordinate)
 
@@ -187,55 +405,55 @@ class GameDisplay:
         drag_state = self.active_drags[mover_id]
         mover = drag_state.mover
 
-        # Calculate proposed grid position
-        proposed_column = (mouse_position[0] - drag_state.offset_x) // self.cell_px
-        proposed_row = (mouse_position[1] - drag_state.offset_y) // self.cell_px
+        # Calculate proposed grid position, kept on the board
+        world_x, world_y = self.world_position(mouse_position)
+        column = (world_x - drag_state.offset_x) // self.cell_px
+        row = (world_y - drag_state.offset_y) // self.cell_px
+        column = max(0, min(column, self.board.dimension.length - mover.dimension.length))
+        row = max(0, min(row, self.board.dimension.height - mover.dimension.height))
 
-        # Boundary checks
-        new_column = max(0, min(proposed_column, self.board.dimension.length - mover.dimension.length))
-        proposed_row = max(0, min(proposed_row, self.board.dimension.height - mover.dimension.height))
-
-        new_column = max(0, min(proposed_column, self.board.dimension.length - mover.dimension.length))
-        # new_row = max(0, min(proposed_row, self.board.dimension.height - mover.dimension.height))
-        new_row = max(0, min(proposed_row, self.board.dimension.height - mover.dimension.height))
-        # Enforce HorizontalMover constraint
-        if isinstance(mover, Castle):
-            proposed_row = new_row
-            proposed_colum = new_column
-            # proposed_column = drag_state.original_coordinate.column
-
-        if isinstance(mover, VerticalMover):
-            proposed_column = drag_state.original_coordinate.column
-
-        # Check against both visual and board states
-        test_coordinate = GridCoordinate(row=proposed_row, column=new_column)
+        test_coordinate = GridCoordinate(row=row, column=column)
+        if test_coordinate == drag_state.current_coordinate:
+            return
+        # Check against both the move rules and the other drags
         if not self.is_position_valid_for_drag(mover, test_coordinate):
             return
-        try:
-            new_coord = GridCoordinate(row=proposed_row, column=proposed_column)
-            self.active_drags[mover_id] = drag_state.with_updated_position(new_coord)
-        except ValueError as e:
-            print(f"Invalid coordinate: {e}")
+        self.release_drag_cells(mover_id, drag_state.current_coordinate, mover.dimension)
+        self.claim_drag_cells(mover_id, test_coordinate, mover.dimension)
+        self.active_drags[mover_id] = drag_state.with_updated_position(test_coordinate)
+
+    def footprint_indices(self, coordinate: GridCoordinate, dimension: Dimension) -> List[int]:
+        length = self.board.dimension.length
+        return [
+            row * length + column
+            for row in range(coordinate.row, coordinate.row + dimension.height)
+            for column in range(coordinate.column, coordinate.column + dimension.length)
+        ]
+
+    def claim_drag_cells(self, mover_id: int, coordinate: GridCoordinate, dimension: Dimension) -> None:
+        for index in self.footprint_indices(coordinate, dimension):
+            self.drag_cells[index] = mover_id
+
+    def release_drag_cells(self, mover_id: int, coordinate: GridCoordinate, dimension: Dimension) -> None:
+        for index in self.footprint_indices(coordinate, dimension):
+            if self.drag_cells.get(index) == mover_id:
+                del self.drag_cells[index]
 
     # Fix 1: Correct the typo in is_position_valid_for_drag method
     def is_position_valid_for_drag(self, mover: Mover, test_coordinate: GridCoordinate) -> bool:
         """Combined check for visual dragging"""
-        # 1. Check board's official position (for static entities)
-        if not self.board.can_entity_move_to_cells(mover, test_coordinate):
+        # 1. Legal destinations under the mover's strategy, precomputed at drag start
+        drag_state = self.active_drags.get(mover.mover_id)
+        if drag_state is not None and drag_state.legal_squares:
+            if drag_state.legal_squares[self.board.square_index(test_coordinate)] != '1':
+                return False
+        elif not self.board.can_entity_move_to_cells(mover, test_coordinate):
             return False
 
-        # 2. Check against other dragged entities
-        for other_id, other_state in self.active_drags.items():
-            if other_id == mover.mover_id:
-                continue
-            other_cells = self.get_occupied_cells(
-                other_state.current_coordinate.row,
-                other_state.current_coordinate.column,
-                other_state.mover.dimension
-            )
-
-            # FIX: Changed columnl to column
-            if self.get_occupied_cells(test_coordinate.row, test_coordinate.column, mover.dimension) & other_cells:
+        # 2. Check against other dragged entities, through the spatial index
+        for index in self.footprint_indices(test_coordinate, mover.dimension):
+            owner = self.drag_cells.get(index)
+            if owner is not None and owner != mover.mover_id:
                 return False
         return True
     # def update_drag(self, mover_id_counter: int, mouse_position: tuple[int, int]) -> None:
@@ -303,19 +521,26 @@ class GameDisplay:
             return PlacementStatus.RELEASED
 
         drag_state = self.active_drags.pop(mover_id)
+        self.release_drag_cells(mover_id, drag_state.current_coordinate, drag_state.mover.dimension)
         if drag_state.current_coordinate == drag_state.original_coordinate:
             return PlacementStatus.RELEASED
 
-        if not self.board.can_entity_move_to_cells(drag_state.mover, drag_state.current_coordinate):
-            self.board.move_entity(
-                mover=drag_state.mover,
-                upper_left_destination=drag_state.original_coordinate
-            )
+        # The board may have changed since the legal squares were computed at drag start, so check the drop again.
+        if not self.is_drop_still_legal(drag_state):
             return PlacementStatus.BLOCKED
 
         moved_entity = self.board.move_entity(mover=drag_state.mover, upper_left_destination= drag_state.current_coordinate)
         return PlacementStatus.PLACED if moved_entity else PlacementStatus.BLOCKED
 
+    def is_drop_still_legal(self, drag_state: DragState) -> bool:
+        mover, destination = drag_state.mover, drag_state.current_coordinate
+        if mover.top_left_coordinate != drag_state.original_coordinate:
+            return False
+        if not self.board.can_entity_move_to_cells(mover, destination):
+            return False
+        legal_mask = mover.movement_strategy.legal_destination_mask(mover, self.board)
+        return bool(legal_mask >> self.board.square_index(destination) & 1)
+
     def get_occupied_cells(self, row: int, column: int, dimension) -> set:
         """Return set of grid coordinates occupied by an entity at the given position"""
         cells = set()
@@ -361,14 +586,80 @@ class GameDisplay:
             print(f"[Warning] Move failed - Movement might be restricted to top row only")
         return move_result
 
-    def update_display(self):
-        self.draw_grid()
-        self.draw_all_entities()
-        pygame.display.flip()
+    def current_scene(self) -> Dict[Tuple[bool, int], Tuple[pygame.Rect, object]]:
+        """Everything on screen this frame, in draw order; entities outside the viewport are left out."""
+        screen_rect = self.screen.get_rect()
+        scene = {}
+        for entity in self.board.entities.values():
+            if entity.top_left_coordinate is not None:
+                rect = self.area_rect(entity.top_left_coordinate, entity.dimension)
+                if rect.colliderect(screen_rect):
+                    scene[(False, self.board.entity_key(entity))] = (rect, entity)
+        for mover_id, drag_state in self.active_drags.items():
+            rect = self.area_rect(drag_state.current_coordinate, drag_state.mover.dimension)
+            if rect.colliderect(screen_rect):
+                scene[(True, mover_id)] = (rect, drag_state)
+        return scene
+
+    def invalidate(self):
+        """Repaint the whole window on the next update_display."""
+        self.needs_full_redraw = True
+
+    def redraw_area(self, area: pygame.Rect, scene: Dict[Tuple[bool, int], Tuple[pygame.Rect, object]]):
+        self.screen.set_clip(area)
+        self.screen.blit(self.background, area, area)
+        blit_items = []
+        for (is_drag, _), (rect, item) in scene.items():
+            if rect.colliderect(area):
+                blit_items += self.drag_blits(item) if is_drag else self.entity_blits(item)
+        self.screen.blits(blit_items, doreturn=False)
+        self.screen.set_clip(None)
+
+    def update_display(self) -> bool:
+        """Redraw and push only the areas whose contents moved since the last frame. False if nothing changed.
+
+        Moves and drags are picked up by comparing where every entity and drag
+        is now against the last frame, so any code path that changes the
+        board gets redrawn without having to report it.
+        """
+        if self.cell_px < self.LOD_CELL_PX:
+            return self.update_coarse_display()
+
+        scene = self.current_scene()
+        if self.needs_full_redraw:
+            self.draw_grid()
+            self.screen.blits([
+                blit_item
+                for (is_drag, _), (_, item) in scene.items()
+                for blit_item in (self.drag_blits(item) if is_drag else self.entity_blits(item))
+            ], doreturn=False)
+            pygame.display.flip()
+            self.drawn_scene = scene
+            self.needs_full_redraw = False
+            return True
+
+        dirty_rects: List[pygame.Rect] = []
+        for key, (rect, _) in scene.items():
+            previous = self.drawn_scene.get(key)
+            if previous is None or previous[0] != rect:
+                dirty_rects.append(rect)
+        for key, (rect, _) in self.drawn_scene.items():
+            current = scene.get(key)
+            if current is None or current[0] != rect:
+                dirty_rects.append(rect)
+        self.drawn_scene = scene
+        if not dirty_rects:
+            return False
+
+        for area in dirty_rects:
+            self.redraw_area(area, scene)
+        pygame.display.update(dirty_rects)
+        return True
 
     def grid_coordinate_at_mouse_position(self, mouse_position: tuple) -> Optional[GridCoordinate]:
-        column = mouse_position[0] // self.cell_px
-        row = mouse_position[1] // self.cell_px
+        world_x, world_y = self.world_position(mouse_position)
+        column = world_x // self.cell_px
+        row = world_y // self.cell_px
 
         if column < 0 or column >= self.board.dimension.length:
             print(f"[Warning] Mouse id outside the game board at: {column}")
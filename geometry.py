@@ -7,8 +7,12 @@ class Direction(Enum):
     DOWN = 2
     LEFT = 3
     RIGHT = 4
+    UP_LEFT = 5
+    UP_RIGHT = 6
+    DOWN_LEFT = 7
+    DOWN_RIGHT = 8
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GridCoordinate:
     row: int
     column: int
@@ -19,7 +23,7 @@ class GridCoordinate:
         if self.column < 0:
             raise ValueError("Column cannot be negative")
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dimension:
 
     MIN_LENGTH = 1
@@ -1,19 +1,24 @@
 from abc import abstractmethod, ABC
 from dataclasses import dataclass, field
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Iterator, Iterable, TYPE_CHECKING
 
-from geometry import Dimension, GridCoordinate
+from geometry import Dimension, GridCoordinate, Direction
+from move_tables import move_tables, ORTHOGONAL_DIRECTIONS, DIAGONAL_DIRECTIONS, STEP_DIRECTIONS
 
-@dataclass
+if TYPE_CHECKING:
+    from board import Board
+
+# Entities compare and hash by identity so the board can index them directly.
+@dataclass(eq=False)
 class GridEntity:
     dimension: Dimension
     top_left_coordinate: Optional[GridCoordinate] = None
 
-@dataclass
+@dataclass(eq=False)
 class BrikPallet(GridEntity):
     pass
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, eq=False)
 class Mover(GridEntity, ABC):
     mover_id: int
     movement_strategy: 'MoveStrategy' = field(init=False, repr=False)
@@ -30,8 +35,11 @@ class Mover(GridEntity, ABC):
         else:
             print(f"Moved {self.mover_id} to {destination_coordinate}.")
 
+    def legal_destinations(self, board: 'Board') -> Iterator[GridCoordinate]:
+        return self.movement_strategy.legal_destinations(self, board)
+
 
-@dataclass
+@dataclass(eq=False)
 class VerticalMover(Mover):
     def __init__(self, *, mover_id: int, length: int, top_left_coordinate: Optional[GridCoordinate] = None):
         self.movement_strategy = VerticalMoveStrategy()
@@ -41,7 +49,7 @@ class VerticalMover(Mover):
             top_left_coordinate=top_left_coordinate
         )
 
-@dataclass
+@dataclass(eq=False)
 class HorizontalMover(Mover):
     def __init__(self, *, mover_id: int, height: int, top_left_coordinate: Optional[GridCoordinate] = None):
         self.movement_strategy = HorizontalMoveStrategy()
@@ -51,7 +59,7 @@ class HorizontalMover(Mover):
             top_left_coordinate=top_left_coordinate
          )
 
-@dataclass
+@dataclass(eq=False)
 class Bishop(Mover):
     def __init__(self, *, mover_id: int,top_left_coordinate: Optional[GridCoordinate] = None):
         self.movement_strategy = BishopMoveStrategy()
@@ -61,7 +69,7 @@ class Bishop(Mover):
             top_left_coordinate=top_left_coordinate
         )
 
-@dataclass
+@dataclass(eq=False)
 class Knight(Mover):
     def __init__(self, *, mover_id: int,top_left_coordinate: Optional[GridCoordinate] = None):
         self.movement_strategy = KnightMoveStrategy()
@@ -71,7 +79,7 @@ class Knight(Mover):
             top_left_coordinate=top_left_coordinate
         )
 
-@dataclass
+@dataclass(eq=False)
 class Castle(Mover):
     def __init__(self, *, mover_id: int, top_left_coordinate: Optional[GridCoordinate] = None):
         self.movement_strategy = CastleMoveStrategy()
@@ -98,7 +106,7 @@ class MoveStrategy(ABC):
         if destination_coordinate.column < 0 or destination_coordinate.column >= board.dimension.length:
             print(f"[Warning] Horizontal move out of bounds: {destination_coordinate.column}")
             return False
-        if destination_coordinate.row < 0 or destination_coordinate.row >= board.dimension.length:
+        if destination_coordinate.row < 0 or destination_coordinate.row >= board.dimension.height:
             print(f"[Warning] Vertical move out of bounds: {destination_coordinate.row}")
             return False
         return True
@@ -106,26 +114,104 @@ class MoveStrategy(ABC):
     def move(self, mover: Mover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
         pass
 
+    @abstractmethod
+    def legal_destinations(self, mover: Mover, board: 'Board') -> Iterator[GridCoordinate]:
+        """Yield every top-left coordinate the mover could legally move to. Nothing is moved or printed."""
+        pass
+
+    def legal_destination_mask(self, mover: Mover, board: 'Board') -> int:
+        """Legal destinations as a bitmask over square indices (row * length + column)."""
+        mask = 0
+        for coordinate in self.legal_destinations(mover, board):
+            mask |= 1 << board.square_index(coordinate)
+        return mask
+
+    @staticmethod
+    def _free_ray_destinations(mover: Mover, board: 'Board', directions: Iterable[Direction]) -> Iterator[GridCoordinate]:
+        if mover.top_left_coordinate is None:
+            return
+        tables = move_tables(board.dimension)
+        origin = board.square_index(mover.top_left_coordinate)
+        for direction in directions:
+            for index in board.grid.ray_reach(tables, direction, origin):
+                yield board.coordinate_at_index(index)
+
+    @staticmethod
+    def _is_ray_path_clear(mover: Mover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
+        """True when nothing stands between the mover and a destination on one of its rays."""
+        origin = mover.top_left_coordinate
+        row_delta = destination_coordinate.row - origin.row
+        column_delta = destination_coordinate.column - origin.column
+        distance = max(abs(row_delta), abs(column_delta))
+        if distance == 0:
+            return True
+        if row_delta != 0 and column_delta != 0 and abs(row_delta) != abs(column_delta):
+            return False
+        direction = STEP_DIRECTIONS[(row_delta // distance, column_delta // distance)]
+        reach = board.grid.ray_reach(move_tables(board.dimension), direction, board.square_index(origin))
+        return len(reach) >= distance
+
+    @staticmethod
+    def _is_slide_clear(mover: Mover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
+        """True when the whole area the mover sweeps between its position and the destination is free."""
+        origin = mover.top_left_coordinate
+        top = min(origin.row, destination_coordinate.row)
+        left = min(origin.column, destination_coordinate.column)
+        swept = Dimension(
+            length=abs(destination_coordinate.column - origin.column) + mover.dimension.length,
+            height=abs(destination_coordinate.row - origin.row) + mover.dimension.height
+        )
+        top_left = GridCoordinate(row=top, column=left)
+        return board.is_area_on_board(top_left, swept) and board.grid.is_area_free(top_left, swept, ignore=mover)
+
+    @staticmethod
+    def _slide_destinations(mover: Mover, board: 'Board', row_step: int, column_step: int) -> Iterator[GridCoordinate]:
+        origin = mover.top_left_coordinate
+        if origin is None:
+            return
+        for step in (-1, 1):
+            row, column = origin.row + step * row_step, origin.column + step * column_step
+            while row >= 0 and column >= 0:
+                destination = GridCoordinate(row=row, column=column)
+                if not board.can_entity_move_to_cells(mover, destination):
+                    break
+                yield destination
+                row, column = row + step * row_step, column + step * column_step
+
 class HorizontalMoveStrategy(MoveStrategy):
     def move(self, mover: HorizontalMover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
         if destination_coordinate.row != mover.top_left_coordinate.row:
             print("[Warning] Destination top_left_coordinate is not on the same row as the mover. Cannot move.")
             return False
 
+        if not self._is_slide_clear(mover, board, destination_coordinate):
+            print("[Warning] Another entity blocks the slide. Cannot move.")
+            return False
+
         destination_column = mover.top_left_coordinate.column
         print("strategy calculated destination column:", destination_column)
         return board.move_entity(destination_coordinate, mover) is not None
 
+    def legal_destinations(self, mover: HorizontalMover, board: 'Board') -> Iterator[GridCoordinate]:
+        return self._slide_destinations(mover, board, 0, 1)
+
 class VerticalMoveStrategy(MoveStrategy):
     def move(self, mover: VerticalMover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
         if destination_coordinate.column != mover.top_left_coordinate.column:
             print("[Warning] Destination top_left_coordinate is not on the same column as the mover. Cannot move.")
             return False
 
+        if not self._is_slide_clear(mover, board, destination_coordinate):
+            print("[Warning] Another entity blocks the slide. Cannot move.")
+            return False
+
         destination_row = mover.top_left_coordinate.row
         print("strategy calculated destination row:", destination_row)
         return board.move_entity(destination_coordinate, mover) is not None
 
+    def legal_destinations(self, mover: VerticalMover, board: 'Board') -> Iterator[GridCoordinate]:
+        return self._slide_destinations(mover, board, 1, 0)
+
 
 class KnightMoveStrategy(MoveStrategy):
     def move(self, mover: Mover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
@@ -145,6 +231,14 @@ class KnightMoveStrategy(MoveStrategy):
         print(f"[Info] Valid knight move from {current_pos} to {destination_coordinate}")
         return board.move_entity(destination_coordinate, mover) is not None
 
+    def legal_destinations(self, mover: Mover, board: 'Board') -> Iterator[GridCoordinate]:
+        if mover.top_left_coordinate is None:
+            return
+        origin = board.square_index(mover.top_left_coordinate)
+        for index in move_tables(board.dimension).knight_targets(origin):
+            if board.grid.occupant_at_index(index) is None:
+                yield board.coordinate_at_index(index)
+
 
 
 class CastleMoveStrategy(MoveStrategy):
@@ -157,6 +251,10 @@ class CastleMoveStrategy(MoveStrategy):
 
         print(f"[DEBUG] Is horizontal: {is_horizontal}, Is vertical: {is_vertical}")
 
+        if (is_horizontal or is_vertical) and not self._is_ray_path_clear(mover, board, destination_coordinate):
+            print("[DEBUG] Move rejected - path is blocked")
+            return False
+
         if is_horizontal or is_vertical:
             result = board.move_entity(destination_coordinate, mover) is not None
             print(f"[DEBUG] Move result: {result}")
@@ -165,6 +263,9 @@ class CastleMoveStrategy(MoveStrategy):
         print("[DEBUG] Move rejected - not horizontal or vertical")
         return False
 
+    def legal_destinations(self, mover: Mover, board: 'Board') -> Iterator[GridCoordinate]:
+        return self._free_ray_destinations(mover, board, ORTHOGONAL_DIRECTIONS)
+
 class BishopMoveStrategy(MoveStrategy):
     def move(self, mover: Mover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
         if not self._check_basic_conditions(mover, board, destination_coordinate):
@@ -178,9 +279,16 @@ class BishopMoveStrategy(MoveStrategy):
             print("[Warning] Diagonal move must have equal row and column delta.")
             return False
 
+        if not self._is_ray_path_clear(mover, board, destination_coordinate):
+            print("[Warning] Diagonal path is blocked by another entity.")
+            return False
+
         print(f"[Info] Diagonal move approved from {origin} to {destination_coordinate}.")
         return board.move_entity(destination_coordinate, mover) is not None
 
+    def legal_destinations(self, mover: Mover, board: 'Board') -> Iterator[GridCoordinate]:
+        return self._free_ray_destinations(mover, board, DIAGONAL_DIRECTIONS)
+
 class DragStrategy(ABC):
     def move(self, mover: Mover, board: 'Board', destination_coordinate: GridCoordinate) -> bool:
         pass
\ No newline at end of file
@@ -0,0 +1,207 @@
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from board import Board
+from constants import BoardStorage
+from entity_factory import EntityFactory
+from geometry import Dimension, GridCoordinate
+from grid_entity import HorizontalMover, VerticalMover
+from position_codec import ENTITY_TYPE_CODES, decode_position
+from sliding_solver import SlidingPuzzle, bfs_layers, slide_tables, solved_states
+
+LEVEL_FILE_MAGIC = b'SLV1'
+# Components bigger than this are abandoned rather than half-explored, since a
+# truncated retrograde search would understate solution lengths.
+DEFAULT_MAX_STATES = 100_000
+# Every level file field is stored as a uint16.
+MAX_FIELD_VALUE = 0xFFFF
+
+
+@dataclass(frozen=True)
+class SlidingLevel:
+    target_mover_id: int
+    # Slides in an optimal solution.
+    solution_length: int
+    # position_codec.encode_position layout.
+    position: Tuple[int, ...]
+
+    def to_board(self) -> Board:
+        return decode_position(self.position)
+
+
+def encode_state(puzzle: SlidingPuzzle, state: int) -> Tuple[int, ...]:
+    """encode_position of the board the puzzle is in at `state`. Walls are not carried over."""
+    encoded = [puzzle.dimension.length, puzzle.dimension.height, BoardStorage.CELLS.value]
+    for piece, position in zip(puzzle.pieces, puzzle.decode(state)):
+        coordinate = piece.coordinate(position)
+        encoded += [
+            ENTITY_TYPE_CODES[HorizontalMover] if piece.slides_along_row else ENTITY_TYPE_CODES[VerticalMover],
+            piece.mover_id,
+            coordinate.row,
+            coordinate.column,
+            piece.dimension.length,
+            piece.dimension.height,
+        ]
+    return tuple(encoded)
+
+
+def hardest_state(puzzle: SlidingPuzzle, max_states: int = DEFAULT_MAX_STATES) -> Optional[Tuple[int, int]]:
+    """(state, optimal solution length) of a state furthest from any solved state in the start's component.
+
+    Slides are reversible, so a breadth-first search outward from every solved
+    state at once labels each state with its optimal solution length. The first
+    pass only enumerates the component to collect those solved states. None if
+    the component is bigger than max_states.
+    """
+    tables = slide_tables(puzzle)
+    solved, explored = [], 0
+    for layer in bfs_layers(puzzle, [puzzle.start], tables):
+        explored += len(layer)
+        if explored > max_states:
+            return None
+        solved.extend(int(state) for state in solved_states(puzzle, layer, tables))
+
+    depth, last_layer = -1, None
+    for layer in bfs_layers(puzzle, solved, tables):
+        depth, last_layer = depth + 1, layer
+    # Layers are sorted, so the first state is the smallest.
+    return int(last_layer[0]), depth
+
+
+def build_solved_board(dimension: Dimension, target_row: int, horizontal_count: int, vertical_count: int,
+                       max_entity_dimension: int, rng: random.Random) -> Tuple[Board, int]:
+    """Board whose 1-high HorizontalMover target already sits at the right edge of target_row, plus random movers.
+
+    Movers are numbered 1..n within the board rather than drawn from id_factory,
+    so ids stay small and depend only on the rng.
+    """
+    board = Board(dimension=dimension)
+    target = HorizontalMover(mover_id=1, height=1)
+    board.add_new_entity(GridCoordinate(row=target_row, column=dimension.length - target.dimension.length), target)
+    first_vertical_id = 2 + horizontal_count
+    movers = (
+        [HorizontalMover(mover_id=mover_id, height=rng.randint(1, max_entity_dimension))
+         for mover_id in range(2, first_vertical_id)] +
+        [VerticalMover(mover_id=mover_id, length=rng.randint(1, max_entity_dimension))
+         for mover_id in range(first_vertical_id, first_vertical_id + vertical_count)]
+    )
+    for mover in movers:
+        EntityFactory.place_randomly(board, mover, rng=rng)
+    return board, target.mover_id
+
+
+def generate_candidate(seed: int, dimension: Dimension, min_solution_length: int, horizontal_count: int,
+                       vertical_count: int, max_entity_dimension: int, max_states: int) -> Optional[SlidingLevel]:
+    """One random layout grown backwards from its solved state; None if it is too easy or too big to search."""
+    rng = random.Random(seed)
+    board, target_id = build_solved_board(dimension, dimension.height // 2, horizontal_count, vertical_count,
+                                          max_entity_dimension, rng)
+    puzzle = SlidingPuzzle.from_board(board, target_id)
+    found = hardest_state(puzzle, max_states)
+    if found is None or found[1] < min_solution_length:
+        return None
+    state, solution_length = found
+    return SlidingLevel(target_mover_id=target_id, solution_length=solution_length,
+                        position=encode_state(puzzle, state))
+
+
+def generate_levels(count: int, min_solution_length: int, dimension: Dimension = Dimension(length=7, height=7),
+                    horizontal_count: int = 8, vertical_count: int = 12, max_entity_dimension: int = 3,
+                    max_states: int = DEFAULT_MAX_STATES, workers: Optional[int] = None, seed: int = 0,
+                    max_attempts: int = 10_000) -> Iterator[SlidingLevel]:
+    """Yield up to `count` levels needing at least min_solution_length slides, searching layouts on every core.
+
+    Each attempt is seeded with seed + attempt number, so a run is reproducible
+    for a fixed seed whatever the worker count.
+    """
+    workers = workers or os.cpu_count() or 1
+    produced = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch_start in range(seed, seed + max_attempts, workers * 4):
+            batch = range(batch_start, min(batch_start + workers * 4, seed + max_attempts))
+            futures = [executor.submit(generate_candidate, attempt_seed, dimension, min_solution_length,
+                                       horizontal_count, vertical_count, max_entity_dimension, max_states)
+                       for attempt_seed in batch]
+            for future in futures:
+                level = future.result()
+                if level is None:
+                    continue
+                yield level
+                produced += 1
+                if produced >= count:
+                    for remaining in futures:
+                        remaining.cancel()
+                    return
+
+
+def write_levels(path: str, levels: List[SlidingLevel]) -> None:
+    """Level file: magic, then per level a little-endian uint16 field count and that many uint16 fields
+    (target id, solution length, encoded position)."""
+    with open(path, 'wb') as level_file:
+        level_file.write(LEVEL_FILE_MAGIC)
+        for level in levels:
+            values = (level.target_mover_id, level.solution_length) + level.position
+            if len(values) > MAX_FIELD_VALUE or not all(0 <= value <= MAX_FIELD_VALUE for value in values):
+                raise ValueError(f"Level for mover {level.target_mover_id} does not fit in uint16 fields.")
+            fields = array('H', values)
+            record = array('H', [len(fields)]) + fields
+            if sys.byteorder != 'little':
+                record.byteswap()
+            level_file.write(record.tobytes())
+
+
+def read_levels(path: str) -> List[SlidingLevel]:
+    with open(path, 'rb') as level_file:
+        data = level_file.read()
+    if not data.startswith(LEVEL_FILE_MAGIC):
+        raise ValueError(f"{path} is not a level file.")
+    values = array('H')
+    values.frombytes(data[len(LEVEL_FILE_MAGIC):])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    levels, index = [], 0
+    while index < len(values):
+        field_count = values[index]
+        fields = values[index + 1:index + 1 + field_count]
+        if len(fields) != field_count:
+            raise ValueError(f"{path} is truncated.")
+        levels.append(SlidingLevel(target_mover_id=fields[0], solution_length=fields[1],
+                                   position=tuple(fields[2:])))
+        index += 1 + field_count
+    return levels
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate solvable sliding-block levels.")
+    parser.add_argument('output', help="Level file to write.")
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--min-length', type=int, default=8, help="Minimum optimal solution length in slides.")
+    parser.add_argument('--size', type=int, default=7, help="Board length and height.")
+    parser.add_argument('--horizontal', type=int, default=8)
+    parser.add_argument('--vertical', type=int, default=12)
+    parser.add_argument('--max-entity-dimension', type=int, default=3)
+    parser.add_argument('--max-states', type=int, default=DEFAULT_MAX_STATES)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    levels = []
+    for level in generate_levels(args.count, args.min_length, Dimension(length=args.size, height=args.size),
+                                 args.horizontal, args.vertical, args.max_entity_dimension, args.max_states,
+                                 args.workers, args.seed):
+        levels.append(level)
+        print(f"Level {len(levels)}: {level.solution_length} slides")
+    write_levels(args.output, levels)
+    print(f"Wrote {len(levels)} levels to {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional, Tuple, Dict
+
+from geometry import Dimension, Direction
+
+KNIGHT_JUMPS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+DIRECTION_STEPS: Dict[Direction, Tuple[int, int]] = {
+    Direction.UP: (-1, 0),
+    Direction.DOWN: (1, 0),
+    Direction.LEFT: (0, -1),
+    Direction.RIGHT: (0, 1),
+    Direction.UP_LEFT: (-1, -1),
+    Direction.UP_RIGHT: (-1, 1),
+    Direction.DOWN_LEFT: (1, -1),
+    Direction.DOWN_RIGHT: (1, 1),
+}
+STEP_DIRECTIONS: Dict[Tuple[int, int], Direction] = {step: direction for direction, step in DIRECTION_STEPS.items()}
+ORTHOGONAL_DIRECTIONS = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+DIAGONAL_DIRECTIONS = (Direction.UP_LEFT, Direction.UP_RIGHT, Direction.DOWN_LEFT, Direction.DOWN_RIGHT)
+
+
+@dataclass
+class MoveTables:
+    """Knight-jump and ray tables for one board size, addressed by square index.
+
+    Entries are filled on first use and kept, so small boards end up fully
+    precomputed while huge boards only pay for the squares pieces stand on.
+    Rays list their squares outward from the origin, excluding the origin.
+    """
+    dimension: Dimension
+
+    knight_targets_cache: List[Optional[Tuple[int, ...]]] = field(init=False, repr=False)
+    knight_masks_cache: List[Optional[int]] = field(init=False, repr=False)
+    rays_cache: Dict[Direction, List[Optional[Tuple[int, ...]]]] = field(init=False, repr=False)
+    ray_masks_cache: Dict[Direction, List[Optional[int]]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        size = self.dimension.area()
+        self.knight_targets_cache = [None] * size
+        self.knight_masks_cache = [None] * size
+        self.rays_cache = {direction: [None] * size for direction in DIRECTION_STEPS}
+        self.ray_masks_cache = {direction: [None] * size for direction in DIRECTION_STEPS}
+
+    def on_board(self, row: int, column: int) -> bool:
+        return 0 <= row < self.dimension.height and 0 <= column < self.dimension.length
+
+    def knight_targets(self, index: int) -> Tuple[int, ...]:
+        targets = self.knight_targets_cache[index]
+        if targets is None:
+            row, column = divmod(index, self.dimension.length)
+            targets = tuple(
+                (row + row_step) * self.dimension.length + column + column_step
+                for row_step, column_step in KNIGHT_JUMPS
+                if self.on_board(row + row_step, column + column_step)
+            )
+            self.knight_targets_cache[index] = targets
+        return targets
+
+    def knight_mask(self, index: int) -> int:
+        mask = self.knight_masks_cache[index]
+        if mask is None:
+            mask = 0
+            for target in self.knight_targets(index):
+                mask |= 1 << target
+            self.knight_masks_cache[index] = mask
+        return mask
+
+    def ray(self, direction: Direction, index: int) -> Tuple[int, ...]:
+        squares = self.rays_cache[direction][index]
+        if squares is None:
+            row_step, column_step = DIRECTION_STEPS[direction]
+            row, column = divmod(index, self.dimension.length)
+            collected = []
+            row, column = row + row_step, column + column_step
+            while self.on_board(row, column):
+                collected.append(row * self.dimension.length + column)
+                row, column = row + row_step, column + column_step
+            squares = tuple(collected)
+            self.rays_cache[direction][index] = squares
+        return squares
+
+    def ray_mask(self, direction: Direction, index: int) -> int:
+        mask = self.ray_masks_cache[direction][index]
+        if mask is None:
+            mask = 0
+            for square in self.ray(direction, index):
+                mask |= 1 << square
+            self.ray_masks_cache[direction][index] = mask
+        return mask
+
+
+@lru_cache(maxsize=16)
+def move_tables(dimension: Dimension) -> MoveTables:
+    return MoveTables(dimension=dimension)
@@ -0,0 +1,298 @@
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Tuple, List, Optional, Dict, Iterator
+
+from cell import Cell
+from free_cell_set import FreeCellSet
+from geometry import Dimension, GridCoordinate, Direction
+from grid_entity import GridEntity
+from move_tables import MoveTables
+
+
+class OccupancyGrid(ABC):
+    """Storage backend behind a Board: who occupies which square.
+
+    Callers (the Board) do bounds checking; backends assume every area they are
+    handed lies on the grid.
+    """
+    dimension: Dimension
+
+    def square_index(self, coordinate: GridCoordinate) -> int:
+        return coordinate.row * self.dimension.length + coordinate.column
+
+    def coordinate_at_index(self, index: int) -> GridCoordinate:
+        row, column = divmod(index, self.dimension.length)
+        return GridCoordinate(row=row, column=column)
+
+    def occupant_at_index(self, index: int) -> Optional[GridEntity]:
+        row, column = divmod(index, self.dimension.length)
+        return self.occupant_at(row, column)
+
+    def ray_reach(self, tables: MoveTables, direction: Direction, origin: int) -> Tuple[int, ...]:
+        """The squares of a ray a sliding piece can reach: everything before the first occupied square."""
+        ray = tables.ray(direction, origin)
+        for distance, index in enumerate(ray):
+            if self.occupant_at_index(index) is not None:
+                return ray[:distance]
+        return ray
+
+    def cell_at_index(self, index: int) -> Cell:
+        row, column = divmod(index, self.dimension.length)
+        return Cell(
+            id=index,
+            coordinate=GridCoordinate(row=row, column=column),
+            occupant=self.occupant_at(row, column)
+        )
+
+    def cell_at(self, row: int, column: int) -> Cell:
+        return self.cell_at_index(row * self.dimension.length + column)
+
+    @property
+    def cells(self) -> Tuple[Tuple[Cell, ...], ...]:
+        """Snapshot of every square as Cell values. Builds one object per square, so avoid it on large grids."""
+        return tuple(
+            tuple(self.cell_at(row, column) for column in range(self.dimension.length))
+            for row in range(self.dimension.height)
+        )
+
+    @abstractmethod
+    def occupant_at(self, row: int, column: int) -> Optional[GridEntity]:
+        pass
+
+    @abstractmethod
+    def is_area_free(self, top_left_coordinate: GridCoordinate, dimension: Dimension,
+                     ignore: Optional[GridEntity] = None) -> bool:
+        """True when no entity other than `ignore` holds a cell of the area."""
+        pass
+
+    @abstractmethod
+    def free_anchors(self, dimension: Dimension, ignore: Optional[GridEntity] = None) -> List[GridCoordinate]:
+        """Every top-left coordinate where an area of the dimension is free, answered in one batch."""
+        pass
+
+    def are_areas_free(self, placements: List[Tuple[GridEntity, GridCoordinate]]) -> bool:
+        """True when every placement is free of other entities and no two placements overlap."""
+        claimed = set()
+        for entity, top_left_coordinate in placements:
+            if not self.is_area_free(top_left_coordinate, entity.dimension, ignore=entity):
+                return False
+            for row in range(top_left_coordinate.row, top_left_coordinate.row + entity.dimension.height):
+                for column in range(top_left_coordinate.column, top_left_coordinate.column + entity.dimension.length):
+                    index = row * self.dimension.length + column
+                    if index in claimed:
+                        return False
+                    claimed.add(index)
+        return True
+
+    @abstractmethod
+    def is_placed(self, entity: GridEntity) -> bool:
+        pass
+
+    @abstractmethod
+    def fill(self, entity: GridEntity, top_left_coordinate: GridCoordinate) -> None:
+        """Write the entity's footprint at the coordinate, vacating any footprint it already had."""
+        pass
+
+    @abstractmethod
+    def clear(self, entity: GridEntity) -> None:
+        pass
+
+    @abstractmethod
+    def footprint_cells(self, entity: GridEntity) -> List[Cell]:
+        pass
+
+    @abstractmethod
+    def area_cells(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[Cell]:
+        pass
+
+    @abstractmethod
+    def area_occupants(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[GridEntity]:
+        pass
+
+    @abstractmethod
+    def empty_cells(self) -> List[Cell]:
+        pass
+
+    @abstractmethod
+    def occupied_cells(self) -> List[Cell]:
+        pass
+
+    @abstractmethod
+    def empty_count(self) -> int:
+        pass
+
+    def occupied_count(self) -> int:
+        return self.dimension.area() - self.empty_count()
+
+    def occupancy_mask(self) -> int:
+        """Bitmask with bit (row * length + column) set for every occupied square."""
+        mask = 0
+        for cell in self.occupied_cells():
+            mask |= 1 << self.square_index(cell.coordinate)
+        return mask
+
+    @abstractmethod
+    def random_empty_cell(self, rng: random.Random = None) -> Optional[Cell]:
+        pass
+
+
+@dataclass
+class BitboardGrid(OccupancyGrid):
+    """Flat per-square occupant list plus a packed-int bitboard of occupancy.
+
+    Squares are addressed by index (row * length + column) and no per-square
+    objects are kept. The target is about 24 bytes per square: an 8-byte
+    occupant slot, 16 bytes of free-cell arrays and one occupancy bit.
+    """
+    dimension: Dimension
+
+    occupants: List[Optional[GridEntity]] = field(init=False, repr=False)
+    # Bit (row * length + column) is set when that cell has an occupant.
+    bits: int = field(init=False, default=0, repr=False)
+    full_mask: int = field(init=False, default=0, repr=False)
+    footprint_masks: Dict[Dimension, int] = field(init=False, default_factory=dict, repr=False)
+    anchor_masks: Dict[Dimension, int] = field(init=False, default_factory=dict, repr=False)
+    # Reverse index: the occupancy bits each placed entity holds.
+    entity_footprints: Dict[GridEntity, int] = field(init=False, default_factory=dict, repr=False)
+    free_cells: FreeCellSet = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.occupants = [None] * self.dimension.area()
+        self.full_mask = (1 << self.dimension.area()) - 1
+        self.free_cells = FreeCellSet.full(self.dimension.area())
+
+    def occupant_at(self, row: int, column: int) -> Optional[GridEntity]:
+        return self.occupants[row * self.dimension.length + column]
+
+    def occupant_at_index(self, index: int) -> Optional[GridEntity]:
+        return self.occupants[index]
+
+    def footprint_mask(self, dimension: Dimension) -> int:
+        """Bitmask of a dimension's footprint anchored at (0, 0). Shift it by a square index to place it."""
+        mask = self.footprint_masks.get(dimension)
+        if mask is None:
+            row_bits = (1 << dimension.length) - 1
+            mask = 0
+            for row in range(dimension.height):
+                mask |= row_bits << (row * self.dimension.length)
+            self.footprint_masks[dimension] = mask
+        return mask
+
+    def area_mask(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> int:
+        return self.footprint_mask(dimension) << self.square_index(top_left_coordinate)
+
+    def anchor_mask(self, dimension: Dimension) -> int:
+        """Bitmask of every top-left square where an area of the dimension stays on the board."""
+        mask = self.anchor_masks.get(dimension)
+        if mask is None:
+            row_count = self.dimension.height - dimension.height + 1
+            column_count = self.dimension.length - dimension.length + 1
+            mask = 0
+            if row_count > 0 and column_count > 0:
+                mask = self.footprint_mask(Dimension(length=column_count, height=row_count))
+            self.anchor_masks[dimension] = mask
+        return mask
+
+    def entity_mask(self, entity: GridEntity) -> int:
+        """Bitmask of the cells the entity currently holds, 0 if it is not placed."""
+        return self.entity_footprints.get(entity, 0)
+
+    def ray_reach(self, tables: MoveTables, direction: Direction, origin: int) -> Tuple[int, ...]:
+        ray = tables.ray(direction, origin)
+        blockers = tables.ray_mask(direction, origin) & self.bits
+        if not blockers:
+            return ray
+        # Rays stepping toward higher indices meet their lowest blocker first.
+        if ray[0] > origin:
+            nearest = (blockers & -blockers).bit_length() - 1
+        else:
+            nearest = blockers.bit_length() - 1
+        row_distance = abs(nearest // self.dimension.length - origin // self.dimension.length)
+        column_distance = abs(nearest % self.dimension.length - origin % self.dimension.length)
+        return ray[:max(row_distance, column_distance) - 1]
+
+    def occupancy_mask(self) -> int:
+        return self.bits
+
+    def iterate_cells(self, mask: int) -> Iterator[Cell]:
+        for index in self.iterate_indices(mask):
+            yield self.cell_at_index(index)
+
+    @staticmethod
+    def iterate_indices(mask: int) -> Iterator[int]:
+        while mask:
+            lowest_bit = mask & -mask
+            yield lowest_bit.bit_length() - 1
+            mask ^= lowest_bit
+
+    def is_area_free(self, top_left_coordinate: GridCoordinate, dimension: Dimension,
+                     ignore: Optional[GridEntity] = None) -> bool:
+        # One AND of the target footprint against everyone else's cells
+        blockers = self.bits & ~self.entity_mask(ignore)
+        return not blockers & self.area_mask(top_left_coordinate, dimension)
+
+    def free_anchors(self, dimension: Dimension, ignore: Optional[GridEntity] = None) -> List[GridCoordinate]:
+        # Shifting the blockers back by each footprint offset marks every anchor whose area they hit.
+        blockers = self.bits & ~self.entity_mask(ignore)
+        blocked = 0
+        for offset in self.iterate_indices(self.footprint_mask(dimension)):
+            blocked |= blockers >> offset
+        return [cell.coordinate for cell in self.iterate_cells(self.anchor_mask(dimension) & ~blocked)]
+
+    def are_areas_free(self, placements: List[Tuple[GridEntity, GridCoordinate]]) -> bool:
+        claimed = 0
+        for entity, top_left_coordinate in placements:
+            footprint = self.area_mask(top_left_coordinate, entity.dimension)
+            if footprint & (claimed | (self.bits & ~self.entity_mask(entity))):
+                return False
+            claimed |= footprint
+        return True
+
+    def is_placed(self, entity: GridEntity) -> bool:
+        return entity in self.entity_footprints
+
+    def fill(self, entity: GridEntity, top_left_coordinate: GridCoordinate) -> None:
+        if entity in self.entity_footprints:
+            self.clear(entity)
+
+        footprint = self.area_mask(top_left_coordinate, entity.dimension)
+        for index in self.iterate_indices(footprint):
+            self.occupants[index] = entity
+            self.free_cells.discard(index)
+        self.bits |= footprint
+        self.entity_footprints[entity] = footprint
+
+    def clear(self, entity: GridEntity) -> None:
+        footprint = self.entity_footprints.pop(entity, 0)
+        for index in self.iterate_indices(footprint):
+            self.occupants[index] = None
+            self.free_cells.add(index)
+        self.bits &= ~footprint
+
+    def footprint_cells(self, entity: GridEntity) -> List[Cell]:
+        return list(self.iterate_cells(self.entity_mask(entity)))
+
+    def area_cells(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[Cell]:
+        return list(self.iterate_cells(self.area_mask(top_left_coordinate, dimension)))
+
+    def area_occupants(self, top_left_coordinate: GridCoordinate, dimension: Dimension) -> List[GridEntity]:
+        occupants = {}
+        for index in self.iterate_indices(self.bits & self.area_mask(top_left_coordinate, dimension)):
+            occupants[self.occupants[index]] = None
+        return list(occupants)
+
+    def empty_cells(self) -> List[Cell]:
+        return list(self.iterate_cells(self.full_mask & ~self.bits))
+
+    def occupied_cells(self) -> List[Cell]:
+        return list(self.iterate_cells(self.bits))
+
+    def empty_count(self) -> int:
+        return self.full_mask.bit_count() - self.bits.bit_count()
+
+    def random_empty_cell(self, rng: random.Random = None) -> Optional[Cell]:
+        index = self.free_cells.sample(rng)
+        if index is None:
+            return None
+        return self.cell_at_index(index)
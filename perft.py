@@ -0,0 +1,118 @@
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Tuple
+
+from board import Board
+from entity_factory import EntityFactory
+from geometry import Dimension, GridCoordinate
+from grid_entity import Castle, Knight, Bishop, HorizontalMover, VerticalMover
+from search import SearchEngine, sides_by_half
+
+KNOWN_COUNTS_PATH = Path(__file__).parent / "perft_counts.json"
+BASELINE_PATH = Path(__file__).parent / "perft_baseline.json"
+# Throughput below this fraction of the saved baseline counts as a regression.
+THROUGHPUT_TOLERANCE = 0.8
+# Runs shorter than this are too noisy to compare against the baseline.
+MIN_TIMED_SECONDS = 0.05
+
+
+def build_config_board() -> Board:
+    """Default Config-sized board with two rows of pieces at the top and bottom edges."""
+    board = Board()
+    pieces = (Castle, Knight, Bishop)
+    placements = []
+    mover_id = 0
+    for row in (0, 1, board.dimension.height - 2, board.dimension.height - 1):
+        for column in range(0, board.dimension.length, 2):
+            mover_id += 1
+            placements.append((pieces[(row + column) % 3](mover_id=mover_id), GridCoordinate(row=row, column=column)))
+    board.add_entities(placements)
+    return board
+
+
+def build_crowded_board(seed: int = 499, attempts: int = 300) -> Board:
+    """A 12x12 board packed with a seeded random mix of pieces and multi-cell movers."""
+    rng = random.Random(seed)
+    board = Board(dimension=Dimension(length=12, height=12))
+    for mover_id in range(1, attempts + 1):
+        kind = rng.randrange(5)
+        if kind == 0:
+            mover = HorizontalMover(mover_id=mover_id, height=rng.randint(2, 3))
+        elif kind == 1:
+            mover = VerticalMover(mover_id=mover_id, length=rng.randint(2, 3))
+        else:
+            mover = (Castle, Knight, Bishop)[kind - 2](mover_id=mover_id)
+        coordinate = GridCoordinate(row=rng.randrange(12), column=rng.randrange(12))
+        if board.can_entity_move_to_cells(mover, coordinate):
+            board.add_new_entity(coordinate, mover)
+    return board
+
+
+SETUPS: Dict[str, Callable[[], Board]] = {
+    "chess_8x8": EntityFactory.build_chess_board,
+    "config_21x21": build_config_board,
+    "crowded_12x12": build_crowded_board,
+}
+
+
+@dataclass
+class PerftResult:
+    setup: str
+    depth: int
+    nodes: int
+    elapsed_seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def perft(engine: SearchEngine, depth: int, side: int) -> int:
+    """Leaf nodes of the move tree to `depth`, with the sides alternating."""
+    if depth == 0:
+        return 1
+    moves = engine.generate_moves(side)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        engine.make(move, side)
+        try:
+            nodes += perft(engine, depth - 1, 1 - side)
+        finally:
+            engine.unmake(side)
+    return nodes
+
+
+def run_perft(setup: str, depth: int) -> PerftResult:
+    board = SETUPS[setup]()
+    sides: Tuple[FrozenSet[int], FrozenSet[int]] = sides_by_half(board)
+    engine = SearchEngine(board=board, sides=sides)
+    started = time.perf_counter()
+    nodes = perft(engine, depth, 0)
+    return PerftResult(setup=setup, depth=depth, nodes=nodes, elapsed_seconds=time.perf_counter() - started)
+
+
+def load_json(path: Path) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def known_cases() -> List[Tuple[str, int, int]]:
+    """(setup, depth, known-good leaf count) for every count stored in perft_counts.json."""
+    known_counts = load_json(KNOWN_COUNTS_PATH)
+    return [
+        (setup, int(depth), nodes)
+        for setup in sorted(known_counts)
+        for depth, nodes in sorted(known_counts[setup].items(), key=lambda item: int(item[0]))
+    ]
+
+
+def save_baseline(results: List[PerftResult]) -> None:
+    """Merge these results' nodes/sec into the throughput baseline file."""
+    baseline = load_json(BASELINE_PATH)
+    for result in results:
+        baseline.setdefault(result.setup, {})[str(result.depth)] = result.nodes_per_second
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
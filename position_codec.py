@@ -0,0 +1,64 @@
+from typing import Dict, Tuple, Type
+
+from board import Board
+from constants import BoardStorage
+from geometry import Dimension, GridCoordinate
+from grid_entity import GridEntity, BrikPallet, Knight, Bishop, Castle, HorizontalMover, VerticalMover
+
+ENTITY_TYPE_CODES: Dict[Type[GridEntity], int] = {
+    BrikPallet: 0,
+    Knight: 1,
+    Bishop: 2,
+    Castle: 3,
+    HorizontalMover: 4,
+    VerticalMover: 5,
+}
+ENTITY_TYPES: Dict[int, Type[GridEntity]] = {code: entity_type for entity_type, code in ENTITY_TYPE_CODES.items()}
+
+HEADER_FIELDS = 3
+ENTITY_FIELDS = 6
+
+
+def encode_position(board: Board) -> Tuple[int, ...]:
+    """Flat int tuple of a board: (length, height, storage) then (type, id, row, column, length, height) per placed entity.
+
+    It pickles to a few bytes per entity, unlike the Board and its grid, so it
+    is what gets sent to worker processes and written to level files.
+    """
+    encoded = [board.dimension.length, board.dimension.height, board.storage.value]
+    for entity in board.entities.values():
+        if entity.top_left_coordinate is None:
+            continue
+        encoded += [
+            ENTITY_TYPE_CODES[type(entity)],
+            getattr(entity, 'mover_id', None) or 0,
+            entity.top_left_coordinate.row,
+            entity.top_left_coordinate.column,
+            entity.dimension.length,
+            entity.dimension.height,
+        ]
+    return tuple(encoded)
+
+
+def build_entity(type_code: int, entity_id: int, length: int, height: int) -> GridEntity:
+    entity_type = ENTITY_TYPES[type_code]
+    if entity_type is HorizontalMover:
+        return HorizontalMover(mover_id=entity_id, height=height)
+    if entity_type is VerticalMover:
+        return VerticalMover(mover_id=entity_id, length=length)
+    if entity_type is BrikPallet:
+        return BrikPallet(dimension=Dimension(length=length, height=height))
+    return entity_type(mover_id=entity_id)
+
+
+def decode_position(encoded: Tuple[int, ...]) -> Board:
+    length, height, storage = encoded[:HEADER_FIELDS]
+    board = Board(dimension=Dimension(length=length, height=height), storage=BoardStorage(storage))
+    placements = []
+    for start in range(HEADER_FIELDS, len(encoded), ENTITY_FIELDS):
+        type_code, entity_id, row, column, entity_length, entity_height = encoded[start:start + ENTITY_FIELDS]
+        placements.append((build_entity(type_code, entity_id, entity_length, entity_height),
+                           GridCoordinate(row=row, column=column)))
+    if board.add_entities(placements) is None:
+        raise ValueError("Encoded position has overlapping entities.")
+    return board
@@ -0,0 +1,175 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple, Type
+
+from bitmask import mask_flags
+from board import Board
+from geometry import Dimension, GridCoordinate
+from grid_entity import (Mover, MoveStrategy, KnightMoveStrategy, CastleMoveStrategy, BishopMoveStrategy,
+                         HorizontalMoveStrategy, VerticalMoveStrategy)
+from move_tables import KNIGHT_JUMPS, DIRECTION_STEPS, ORTHOGONAL_DIRECTIONS, DIAGONAL_DIRECTIONS
+
+UNREACHABLE = -1
+FLAG_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+# (row step, column step) pairs per strategy, and whether the mover keeps going along a step while it is free.
+STRATEGY_STEPS: Dict[Type[MoveStrategy], Tuple[Tuple[Tuple[int, int], ...], bool]] = {
+    KnightMoveStrategy: (KNIGHT_JUMPS, False),
+    CastleMoveStrategy: (tuple(DIRECTION_STEPS[direction] for direction in ORTHOGONAL_DIRECTIONS), True),
+    BishopMoveStrategy: (tuple(DIRECTION_STEPS[direction] for direction in DIAGONAL_DIRECTIONS), True),
+    HorizontalMoveStrategy: (((0, -1), (0, 1)), True),
+    VerticalMoveStrategy: (((-1, 0), (1, 0)), True),
+}
+
+
+def footprint_mask(board_dimension: Dimension, dimension: Dimension) -> int:
+    row_bits = (1 << dimension.length) - 1
+    mask = 0
+    for row in range(dimension.height):
+        mask |= row_bits << (row * board_dimension.length)
+    return mask
+
+
+@dataclass
+class DistanceMap:
+    """Fewest moves a mover needs to bring its top-left to each square, with everything else on the board held still.
+
+    `dependency_mask` covers every square whose occupancy the search looked at;
+    the map stays correct for as long as those squares keep the occupancy
+    recorded in `dependency_snapshot`.
+    """
+    dimension: Dimension
+    origin: int
+    distances: array
+    dependency_mask: int
+    dependency_snapshot: int
+    zobrist_hash: int
+
+    def distance_to(self, coordinate: GridCoordinate) -> Optional[int]:
+        if not (0 <= coordinate.row < self.dimension.height and 0 <= coordinate.column < self.dimension.length):
+            return None
+        distance = self.distances[coordinate.row * self.dimension.length + coordinate.column]
+        return None if distance == UNREACHABLE else distance
+
+    def reachable(self) -> Iterator[Tuple[GridCoordinate, int]]:
+        for index, distance in enumerate(self.distances):
+            if distance != UNREACHABLE:
+                row, column = divmod(index, self.dimension.length)
+                yield GridCoordinate(row=row, column=column), distance
+
+
+def build_distance_map(board: Board, mover: Mover) -> DistanceMap:
+    """Breadth-first search over the mover's top-left squares under its movement strategy."""
+    if mover.top_left_coordinate is None:
+        raise ValueError("Mover must be placed on the board.")
+    steps, slides = STRATEGY_STEPS[type(mover.movement_strategy)]
+    length, area = board.dimension.length, board.dimension.area()
+    last_row = board.dimension.height - mover.dimension.height
+    last_column = length - mover.dimension.length
+    footprint = footprint_mask(board.dimension, mover.dimension)
+    origin = board.square_index(mover.top_left_coordinate)
+    obstacles = board.grid.occupancy_mask() & ~(footprint << origin)
+
+    # Shifting the obstacles back by each footprint offset marks every top-left they would overlap.
+    blocked, offsets = 0, []
+    remaining = footprint
+    while remaining:
+        lowest_bit = remaining & -remaining
+        offsets.append(lowest_bit.bit_length() - 1)
+        remaining ^= lowest_bit
+    for offset in offsets:
+        blocked |= obstacles >> offset
+    blocked_flags = mask_flags(blocked, area)
+
+    distances = array('h', [UNREACHABLE]) * area
+    examined = bytearray(area)
+    distances[origin] = 0
+    examined[origin] = 1
+    queue = [origin]
+    for anchor in queue:
+        next_distance = distances[anchor] + 1
+        anchor_row, anchor_column = divmod(anchor, length)
+        for row_step, column_step in steps:
+            row, column = anchor_row + row_step, anchor_column + column_step
+            while 0 <= row <= last_row and 0 <= column <= last_column:
+                index = row * length + column
+                examined[index] = 1
+                if blocked_flags[index] == '1':
+                    break
+                distance = distances[index]
+                if distance == UNREACHABLE:
+                    distances[index] = next_distance
+                    queue.append(index)
+                elif distance < next_distance:
+                    # A square settled earlier makes its own walk along this step; everything past it is covered.
+                    break
+                if not slides:
+                    break
+                row, column = row + row_step, column + column_step
+
+    examined_mask = int(examined[::-1].translate(FLAG_DIGITS), 2)
+    dependency = 0
+    for offset in offsets:
+        dependency |= examined_mask << offset
+    return DistanceMap(
+        dimension=board.dimension,
+        origin=origin,
+        distances=distances,
+        dependency_mask=dependency,
+        dependency_snapshot=obstacles & dependency,
+        zobrist_hash=board.zobrist_hash,
+    )
+
+
+class ReachabilityCache:
+    """LRU of DistanceMaps for one board, keyed by (mover, its top-left square).
+
+    A map built under the current zobrist hash is returned as is. After other
+    pieces move, it is kept if none of the squares it depends on changed
+    occupancy, and rebuilt otherwise, so a move only invalidates the maps it
+    could affect.
+    """
+    DEFAULT_CAPACITY = 256
+
+    def __init__(self, board: Board, capacity: int = DEFAULT_CAPACITY):
+        self.board = board
+        self.capacity = capacity
+        self.maps: 'OrderedDict[Tuple[int, int], DistanceMap]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def distance_map(self, mover: Mover) -> DistanceMap:
+        if mover.top_left_coordinate is None:
+            raise ValueError("Mover must be placed on the board.")
+        key = (Board.entity_key(mover), self.board.square_index(mover.top_left_coordinate))
+        cached = self.maps.get(key)
+        if cached is not None and self.is_current(cached, mover):
+            self.maps.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        distance_map = build_distance_map(self.board, mover)
+        self.maps[key] = distance_map
+        self.maps.move_to_end(key)
+        while len(self.maps) > self.capacity:
+            self.maps.popitem(last=False)
+        return distance_map
+
+    def is_current(self, distance_map: DistanceMap, mover: Mover) -> bool:
+        if distance_map.zobrist_hash == self.board.zobrist_hash:
+            return True
+        own_cells = footprint_mask(self.board.dimension, mover.dimension) << distance_map.origin
+        obstacles = self.board.grid.occupancy_mask() & ~own_cells
+        if obstacles & distance_map.dependency_mask != distance_map.dependency_snapshot:
+            return False
+        distance_map.zobrist_hash = self.board.zobrist_hash
+        return True
+
+    def distance(self, mover: Mover, destination: GridCoordinate) -> Optional[int]:
+        """Fewest moves for the mover to reach the destination, None if it never can."""
+        return self.distance_map(mover).distance_to(destination)
+
+    def clear(self) -> None:
+        self.maps.clear()
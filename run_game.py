@@ -8,32 +8,19 @@ from board import Board
 
 from grid_entity import Bishop, VerticalMover, Castle, Knight
 
+from entity_factory import EntityFactory
 from game_display import GameDisplay
 from id_factory import id_factory
 
 sys.path.append(str(Path(__file__).parent.absolute()))
 
-def main():
-    board = Board(dimension=Dimension(length=8, height=8))
-
-    board.add_new_entity(GridCoordinate(7,0), Castle(mover_id=id_factory.mover_id()))
-    board.add_new_entity(GridCoordinate(7,7), Castle(mover_id=id_factory.mover_id()))
-
-    board.add_new_entity(GridCoordinate(7,1), Knight(mover_id=id_factory.mover_id()))
-    board.add_new_entity(GridCoordinate(7,6), Knight(mover_id=id_factory.mover_id()))
-
-    board.add_new_entity(GridCoordinate(0,1), Knight(mover_id=id_factory.mover_id()))
-    board.add_new_entity(GridCoordinate(0,6), Knight(mover_id=id_factory.mover_id()))
-
+# Longest the loop blocks waiting for an event while the board is idle.
+IDLE_WAIT_MS = 500
+# Frame cap while dragging a piece or panning; motion events arriving between frames are merged.
+DRAG_FRAMES_PER_SECOND = 120
 
-    board.add_new_entity(GridCoordinate(1,0), Castle(mover_id=id_factory.mover_id()))
-    board.add_new_entity(GridCoordinate(1,7), Castle(mover_id=id_factory.mover_id()))
-
-    board.add_new_entity(GridCoordinate(7, 2), Bishop(mover_id=id_factory.mover_id()))
-    board.add_new_entity(GridCoordinate(7, 5), Bishop(mover_id=id_factory.mover_id()))
-
-    board.add_new_entity(GridCoordinate(0, 2), Bishop(mover_id=id_factory.mover_id()))
-    board.add_new_entity(GridCoordinate(0, 5), Bishop(mover_id=id_factory.mover_id()))
+def main():
+    board = EntityFactory.build_chess_board()
 
     #
     # board.add_new_entity(GridCoordinate(7,0), VerticalMover(mover_id=id_factory.mover_id(), length=1))
@@ -75,25 +62,39 @@ def main():
 
 
     clock = pygame.time.Clock()
-    frame_count = 0
 
     running = True
     while running:
-        for event in pygame.event.get():
+        # Sleep until something happens; the timeout only bounds how long the loop can go unchecked.
+        events = [pygame.event.wait(IDLE_WAIT_MS)] + pygame.event.get()
+        pending_motion = None
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                visualizer.handle_mouse_down(event)
-            elif event.type == pygame.MOUSEBUTTONUP:
-                visualizer.handle_mouse_up(event)
             elif event.type == pygame.MOUSEMOTION:
-                visualizer.handle_mouse_motion(event)
-
+                # Only the latest position of a burst matters.
+                pending_motion = event
+            elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                if pending_motion is not None:
+                    visualizer.handle_mouse_motion(pending_motion)
+                    pending_motion = None
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    visualizer.handle_mouse_down(event)
+                else:
+                    visualizer.handle_mouse_up(event)
+            elif event.type == pygame.MOUSEWHEEL:
+                visualizer.handle_mouse_wheel(event)
+            elif event.type == pygame.KEYDOWN:
+                visualizer.handle_key_down(event)
+            elif event.type == pygame.WINDOWEXPOSED:
+                visualizer.invalidate()
+        if pending_motion is not None:
+            visualizer.handle_mouse_motion(pending_motion)
+
+        # Pushes nothing unless something on screen changed.
         visualizer.update_display()
-        clock.tick(200)
-        frame_count += 1
-        if frame_count % 60== 0:
-            print(f"Frame {frame_count}")
+        if visualizer.is_dragging or visualizer.pan_anchor is not None:
+            clock.tick(DRAG_FRAMES_PER_SECOND)
     visualizer.close()
 
 if __name__ == "__main__":
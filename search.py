@@ -0,0 +1,385 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from board import Board
+from geometry import GridCoordinate
+from grid_entity import Mover
+from position_codec import encode_position, decode_position
+from zobrist import zobrist_key
+
+MATE_SCORE = 1_000_000
+MATE_THRESHOLD = MATE_SCORE - 10_000
+INFINITY = MATE_SCORE + 1
+SIDE_TO_MOVE_KEY = 0x9E3779B97F4A7C15
+
+
+class Bound(Enum):
+    EXACT = auto()
+    LOWER = auto()
+    UPPER = auto()
+
+
+@dataclass(frozen=True)
+class SearchMove:
+    mover_id: int
+    destination: GridCoordinate
+
+
+@dataclass(frozen=True)
+class TranspositionEntry:
+    depth: int
+    score: int
+    bound: Bound
+    best_move: Optional[SearchMove]
+
+
+@dataclass
+class SearchResult:
+    best_move: Optional[SearchMove]
+    score: int
+    depth_reached: int
+    nodes: int
+    elapsed_seconds: float
+    principal_variation: List[SearchMove] = field(default_factory=list)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the wall-clock budget runs out."""
+    pass
+
+
+def sides_by_half(board: Board) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+    """Split movers into the side starting in the top half and the side starting in the bottom half."""
+    top, bottom = set(), set()
+    for mover in board.get_all_movers():
+        if mover.top_left_coordinate is None:
+            continue
+        (top if mover.top_left_coordinate.row < board.dimension.height / 2 else bottom).add(mover.mover_id)
+    return frozenset(top), frozenset(bottom)
+
+
+@dataclass
+class SearchEngine:
+    """Negamax alpha-beta over Board.make_move/unmake_move.
+
+    Sides are sets of mover ids. The game has no captures, so a side to move
+    with no legal destinations loses, and positions are scored by the
+    difference in legal destinations (mobility). Move ordering tries the
+    transposition-table move first, then killer moves, then history scores.
+    """
+    MAX_TABLE_ENTRIES = 1_000_000
+    KILLER_SLOTS = 2
+
+    board: Board
+    sides: Tuple[FrozenSet[int], FrozenSet[int]]
+
+    transposition_table: Dict[int, TranspositionEntry] = field(default_factory=dict, repr=False)
+    killer_moves: List[List[SearchMove]] = field(default_factory=list, repr=False)
+    history: Dict[SearchMove, int] = field(default_factory=dict, repr=False)
+    # Zobrist terms for which side owns each piece; Board.zobrist_hash only knows piece types.
+    side_hash: int = field(init=False, default=0, repr=False)
+    nodes: int = field(init=False, default=0, repr=False)
+    deadline: float = field(init=False, default=0.0, repr=False)
+    # One result per completed iterative-deepening depth of the last search.
+    iterations: List[SearchResult] = field(init=False, default_factory=list, repr=False)
+
+    def __post_init__(self):
+        self.side_hash = 0
+        for mover_id in self.sides[1]:
+            mover = self.board.get_mover_by_id(mover_id)
+            if mover is not None and mover.top_left_coordinate is not None:
+                self.side_hash ^= zobrist_key(mover, self.board.square_index(mover.top_left_coordinate), 1)
+
+    def position_key(self, side: int) -> int:
+        return self.board.zobrist_hash ^ self.side_hash ^ (SIDE_TO_MOVE_KEY if side else 0)
+
+    def side_movers(self, side: int) -> List[Mover]:
+        movers = []
+        for mover_id in sorted(self.sides[side]):
+            mover = self.board.get_mover_by_id(mover_id)
+            if mover is not None and mover.top_left_coordinate is not None:
+                movers.append(mover)
+        return movers
+
+    def generate_moves(self, side: int) -> List[SearchMove]:
+        return [
+            SearchMove(mover_id=mover.mover_id, destination=destination)
+            for mover in self.side_movers(side)
+            for destination in mover.movement_strategy.legal_destinations(mover, self.board)
+        ]
+
+    def mobility(self, side: int) -> int:
+        return sum(
+            1
+            for mover in self.side_movers(side)
+            for _ in mover.movement_strategy.legal_destinations(mover, self.board)
+        )
+
+    def make(self, move: SearchMove, side: int) -> None:
+        mover = self.board.get_mover_by_id(move.mover_id)
+        origin = mover.top_left_coordinate
+        if self.board.make_move(mover, move.destination) is None:
+            raise ValueError(f"Search generated an illegal move {move}.")
+        if side == 1:
+            self.side_hash ^= (zobrist_key(mover, self.board.square_index(origin), 1) ^
+                               zobrist_key(mover, self.board.square_index(move.destination), 1))
+
+    def unmake(self, side: int) -> None:
+        record = self.board.unmake_move()
+        if side == 1:
+            self.side_hash ^= (zobrist_key(record.mover, self.board.square_index(record.destination), 1) ^
+                               zobrist_key(record.mover, self.board.square_index(record.origin), 1))
+
+    def order_moves(self, moves: List[SearchMove], table_move: Optional[SearchMove], ply: int) -> List[SearchMove]:
+        killers = self.killer_moves[ply] if ply < len(self.killer_moves) else []
+
+        def priority(move: SearchMove) -> int:
+            if move == table_move:
+                return 3 * MATE_SCORE
+            if move in killers:
+                return 2 * MATE_SCORE - killers.index(move)
+            return self.history.get(move, 0)
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def record_cutoff(self, move: SearchMove, depth: int, ply: int) -> None:
+        while len(self.killer_moves) <= ply:
+            self.killer_moves.append([])
+        killers = self.killer_moves[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.KILLER_SLOTS:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def store(self, key: int, depth: int, score: int, bound: Bound, best_move: Optional[SearchMove], ply: int) -> None:
+        if len(self.transposition_table) >= self.MAX_TABLE_ENTRIES and key not in self.transposition_table:
+            self.transposition_table.clear()
+        # Mate scores are stored relative to the stored node, not the root.
+        if score > MATE_THRESHOLD:
+            score += ply
+        elif score < -MATE_THRESHOLD:
+            score -= ply
+        self.transposition_table[key] = TranspositionEntry(depth=depth, score=score, bound=bound, best_move=best_move)
+
+    def negamax(self, depth: int, alpha: int, beta: int, side: int, ply: int) -> int:
+        self.nodes += 1
+        # Generating moves costs far more than reading the clock, so every node checks the budget.
+        if time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+        key = self.position_key(side)
+        entry = self.transposition_table.get(key)
+        table_move = None
+        if entry is not None:
+            table_move = entry.best_move
+            if entry.depth >= depth and ply > 0:
+                score = entry.score
+                if score > MATE_THRESHOLD:
+                    score -= ply
+                elif score < -MATE_THRESHOLD:
+                    score += ply
+                if entry.bound == Bound.EXACT:
+                    return score
+                if entry.bound == Bound.LOWER and score >= beta:
+                    return score
+                if entry.bound == Bound.UPPER and score <= alpha:
+                    return score
+
+        moves = self.generate_moves(side)
+        if not moves:
+            return -MATE_SCORE + ply
+        if depth == 0:
+            return len(moves) - self.mobility(1 - side)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in self.order_moves(moves, table_move, ply):
+            self.make(move, side)
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, 1 - side, ply + 1)
+            finally:
+                self.unmake(side)
+
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.record_cutoff(move, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.store(key, depth, best_score, bound, best_move, ply)
+        return best_score
+
+    def principal_variation(self, side: int, depth: int) -> List[SearchMove]:
+        line = []
+        seen = set()
+        try:
+            while len(line) < depth:
+                key = self.position_key(side)
+                entry = self.transposition_table.get(key)
+                if entry is None or entry.best_move is None or key in seen:
+                    break
+                seen.add(key)
+                self.make(entry.best_move, side)
+                line.append(entry.best_move)
+                side = 1 - side
+        finally:
+            for _ in line:
+                side = 1 - side
+                self.unmake(side)
+        return line
+
+    def search(self, side: int, time_limit_seconds: float = 1.0, max_depth: int = 64,
+               root_moves: Optional[Sequence[SearchMove]] = None) -> SearchResult:
+        """Iteratively deepen until max_depth or the time budget; returns the deepest completed result.
+
+        `root_moves` restricts the moves considered at the root.
+        """
+        started = time.perf_counter()
+        self.deadline = started + time_limit_seconds
+        self.nodes = 0
+        self.killer_moves = []
+        self.iterations = []
+
+        moves = list(root_moves) if root_moves is not None else self.generate_moves(side)
+        if not moves:
+            return SearchResult(best_move=None, score=-MATE_SCORE, depth_reached=0, nodes=0,
+                                elapsed_seconds=time.perf_counter() - started)
+
+        result = SearchResult(best_move=moves[0], score=0, depth_reached=0, nodes=0, elapsed_seconds=0.0,
+                              principal_variation=[moves[0]])
+        for depth in range(1, max_depth + 1):
+            try:
+                best_move, score = self.search_root(moves, depth, side)
+            except SearchTimeout:
+                break
+            # Keep the best move first so the next iteration searches it first.
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            principal_variation = [best_move]
+            self.make(best_move, side)
+            try:
+                principal_variation += self.principal_variation(1 - side, depth - 1)
+            finally:
+                self.unmake(side)
+            result = SearchResult(best_move=best_move, score=score, depth_reached=depth, nodes=self.nodes,
+                                  elapsed_seconds=time.perf_counter() - started,
+                                  principal_variation=principal_variation)
+            self.iterations.append(result)
+            if abs(score) > MATE_THRESHOLD:
+                break
+
+        result.nodes = self.nodes
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+    def search_root(self, moves: List[SearchMove], depth: int, side: int) -> Tuple[SearchMove, int]:
+        alpha, beta = -INFINITY, INFINITY
+        best_move, best_score = moves[0], -INFINITY
+        for move in moves:
+            self.make(move, side)
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, 1 - side, 1)
+            finally:
+                self.unmake(side)
+            if score > best_score:
+                best_move, best_score = move, score
+            alpha = max(alpha, score)
+        return best_move, best_score
+
+
+# Pools kept alive between parallel_search calls, keyed by worker count, so a move doesn't pay for process start-up.
+_executors: Dict[int, ProcessPoolExecutor] = {}
+
+
+def shared_executor(workers: int) -> ProcessPoolExecutor:
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[workers]
+
+
+def _search_root_chunk(position: Tuple[int, ...], sides: Tuple[FrozenSet[int], FrozenSet[int]], side: int,
+                       root_moves: List[SearchMove], deadline: float,
+                       max_depth: int) -> Tuple[List[SearchResult], int]:
+    """Completed iterations and the total nodes searched, including any unfinished last depth.
+
+    `deadline` is a time.time() value, since perf_counter readings are not comparable across processes.
+    """
+    engine = SearchEngine(board=decode_position(position), sides=sides)
+    time_limit_seconds = max(0.0, deadline - time.time())
+    engine.search(side, time_limit_seconds=time_limit_seconds, max_depth=max_depth, root_moves=root_moves)
+    return engine.iterations, engine.nodes
+
+
+def parallel_search(board: Board, side: int, sides: Tuple[FrozenSet[int], FrozenSet[int]], workers: int,
+                    time_limit_seconds: float = 1.0, max_depth: int = 64,
+                    executor: Optional[ProcessPoolExecutor] = None) -> SearchResult:
+    """Root-parallel search: root moves are dealt round-robin to worker processes.
+
+    Workers get the position as an encode_position tuple. The merged result
+    comes from the deepest depth every worker completed, so the scores
+    compared were searched to the same depth. The budget runs from the call,
+    so time spent handing work to the pool counts against it. Without an
+    `executor` a pool of `workers` processes is created once and reused.
+    """
+    started = time.perf_counter()
+    deadline = time.time() + time_limit_seconds
+    moves = SearchEngine(board=board, sides=sides).generate_moves(side)
+    if not moves:
+        return SearchResult(best_move=None, score=-MATE_SCORE, depth_reached=0, nodes=0, elapsed_seconds=0.0)
+
+    executor = executor if executor is not None else shared_executor(workers)
+    position = encode_position(board)
+    chunks = [moves[start::workers] for start in range(min(workers, len(moves)))]
+    futures = [
+        executor.submit(_search_root_chunk, position, sides, side, chunk, deadline, max_depth)
+        for chunk in chunks
+    ]
+    chunk_results = [future.result() for future in futures]
+    chunk_iterations = [iterations for iterations, _ in chunk_results]
+
+    nodes = sum(chunk_nodes for _, chunk_nodes in chunk_results)
+    elapsed = time.perf_counter() - started
+    # A chunk that stopped early on a forced result keeps that result at every deeper depth.
+    open_depths = [len(iterations) for iterations in chunk_iterations
+                   if not iterations or abs(iterations[-1].score) <= MATE_THRESHOLD]
+    common_depth = min(open_depths) if open_depths else max(len(iterations) for iterations in chunk_iterations)
+    if common_depth == 0:
+        return SearchResult(best_move=moves[0], score=0, depth_reached=0, nodes=nodes, elapsed_seconds=elapsed,
+                            principal_variation=[moves[0]])
+
+    best = max((iterations[min(common_depth, len(iterations)) - 1] for iterations in chunk_iterations),
+               key=lambda result: result.score)
+    return SearchResult(best_move=best.best_move, score=best.score, depth_reached=common_depth, nodes=nodes,
+                        elapsed_seconds=elapsed, principal_variation=best.principal_variation)
+
+
+def choose_move(board: Board, side: int, sides: Optional[Tuple[FrozenSet[int], FrozenSet[int]]] = None,
+                time_limit_seconds: float = 1.0, max_depth: int = 64, workers: int = 1,
+                executor: Optional[ProcessPoolExecutor] = None) -> SearchResult:
+    """Pick a move for `side` (0 or 1) on the board. Sides default to sides_by_half.
+
+    With workers > 1 the root moves are searched in that many processes, on
+    `executor` if given or else a pool shared between calls.
+    """
+    sides = sides if sides is not None else sides_by_half(board)
+    if workers > 1:
+        return parallel_search(board, side, sides, workers, time_limit_seconds=time_limit_seconds,
+                               max_depth=max_depth, executor=executor)
+    engine = SearchEngine(board=board, sides=sides)
+    return engine.search(side, time_limit_seconds=time_limit_seconds, max_depth=max_depth)
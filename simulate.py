@@ -0,0 +1,148 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Iterator, List, Optional
+
+from perft import SETUPS
+from search import SearchEngine, sides_by_half
+
+PLAYERS = ("random", "ai")
+SIDE_NAMES = ("top", "bottom")
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    game: int
+    seed: int
+    setup: str
+    players: tuple
+    max_plies: int
+    ai_depth: int
+    ai_time_seconds: float
+
+
+@dataclass
+class GameResult:
+    game: int
+    seed: int
+    setup: str
+    top_player: str
+    bottom_player: str
+    plies: int
+    # "top", "bottom", or "draw" when max_plies ran out.
+    outcome: str
+    seconds: float
+    search_nodes: int
+
+
+def play_game(spec: GameSpec) -> GameResult:
+    """Play one game headless. The side to move with no legal move loses; sides are sides_by_half of the setup."""
+    started = time.perf_counter()
+    rng = random.Random(spec.seed)
+    board = SETUPS[spec.setup]()
+    engine = SearchEngine(board=board, sides=sides_by_half(board))
+    side, plies, outcome, nodes = 0, 0, "draw", 0
+    while plies < spec.max_plies:
+        if spec.players[side] == "ai":
+            result = engine.search(side, time_limit_seconds=spec.ai_time_seconds, max_depth=spec.ai_depth)
+            move = result.best_move
+            nodes += result.nodes
+        else:
+            moves = engine.generate_moves(side)
+            move = rng.choice(moves) if moves else None
+        if move is None:
+            outcome = SIDE_NAMES[1 - side]
+            break
+        engine.make(move, side)
+        plies += 1
+        side = 1 - side
+    return GameResult(
+        game=spec.game,
+        seed=spec.seed,
+        setup=spec.setup,
+        top_player=spec.players[0],
+        bottom_player=spec.players[1],
+        plies=plies,
+        outcome=outcome,
+        seconds=time.perf_counter() - started,
+        search_nodes=nodes,
+    )
+
+
+def run_games(specs: List[GameSpec], workers: int) -> Iterator[GameResult]:
+    """Results in game order, streamed as soon as each game and every one before it has finished."""
+    if workers <= 1:
+        yield from map(play_game, specs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(play_game, specs, chunksize=max(1, len(specs) // (workers * 8)))
+
+
+class ResultWriter:
+    """Appends GameResults to a JSONL or CSV file, flushing each line so partial runs are still readable."""
+
+    def __init__(self, path: str, output_format: str):
+        self.file = open(path, 'w', newline='')
+        self.csv_writer = None
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=[field.name for field in fields(GameResult)])
+            self.csv_writer.writeheader()
+
+    def write(self, result: GameResult) -> None:
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(asdict(result))
+        else:
+            self.file.write(json.dumps(asdict(result)) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Play games headless over a process pool and log the results.")
+    parser.add_argument("output", help="Results file; .csv writes CSV, anything else JSON lines.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--setup", choices=sorted(SETUPS), default="chess_8x8")
+    parser.add_argument("--top", choices=PLAYERS, default="random", help="Player for the side starting at the top.")
+    parser.add_argument("--bottom", choices=PLAYERS, default="random")
+    parser.add_argument("--max-plies", type=int, default=200, help="Plies before a game is scored a draw.")
+    parser.add_argument("--ai-depth", type=int, default=2)
+    parser.add_argument("--ai-time", type=float, default=1.0, help="Seconds per AI move.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0, help="Game i is seeded with seed + i.")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="Overrides the format implied by the extension.")
+    arguments = parser.parse_args(argv)
+
+    output_format = arguments.format or ("csv" if arguments.output.endswith(".csv") else "jsonl")
+    specs = [
+        GameSpec(game=game, seed=arguments.seed + game, setup=arguments.setup,
+                 players=(arguments.top, arguments.bottom), max_plies=arguments.max_plies,
+                 ai_depth=arguments.ai_depth, ai_time_seconds=arguments.ai_time)
+        for game in range(arguments.games)
+    ]
+
+    started = time.perf_counter()
+    outcomes = {"top": 0, "bottom": 0, "draw": 0}
+    writer = ResultWriter(arguments.output, output_format)
+    try:
+        for result in run_games(specs, arguments.workers):
+            writer.write(result)
+            outcomes[result.outcome] += 1
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"{arguments.games} games in {elapsed:.2f}s ({arguments.games / elapsed:.1f} games/sec) "
+          f"top {outcomes['top']}, bottom {outcomes['bottom']}, draw {outcomes['draw']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # without numpy the solver falls back to expanding one state at a time
+    np = None
+
+from board import Board
+from exception import StateLimitExceededError
+from geometry import Dimension, GridCoordinate
+from grid_entity import HorizontalMover, VerticalMover
+
+# A breadth-first layer of packed states, sorted and without duplicates: a numpy uint64 array while
+# states fit in 64 bits, a list of ints otherwise.
+StateLayer = Sequence[int]
+
+
+@dataclass(frozen=True)
+class SlidingPiece:
+    """A HorizontalMover (slides along its row) or VerticalMover (slides along its column)."""
+    mover_id: int
+    slides_along_row: bool
+    # The row a row-slider keeps, or the column a column-slider keeps.
+    fixed: int
+    dimension: Dimension
+
+    def position_count(self, board_dimension: Dimension) -> int:
+        if self.slides_along_row:
+            return board_dimension.length - self.dimension.length + 1
+        return board_dimension.height - self.dimension.height + 1
+
+    def coordinate(self, position: int) -> GridCoordinate:
+        if self.slides_along_row:
+            return GridCoordinate(row=self.fixed, column=position)
+        return GridCoordinate(row=position, column=self.fixed)
+
+
+@dataclass
+class SlidingPuzzle:
+    """Rush-Hour style puzzle: every piece's position along its axis packed into one int.
+
+    The target is solved once it reaches `goal_position`, which defaults to the
+    far end of its axis. Any other entity on the source board is a fixed wall.
+    """
+    dimension: Dimension
+    pieces: Tuple[SlidingPiece, ...]
+    target: int
+    start: int
+    wall_mask: int = 0
+    goal_position: Optional[int] = None
+
+    shifts: List[int] = field(init=False, repr=False)
+    field_masks: List[int] = field(init=False, repr=False)
+    # position_masks[piece][position] is the piece's occupancy bitboard at that position.
+    position_masks: List[List[int]] = field(init=False, repr=False)
+    state_bits: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.shifts, self.field_masks, self.position_masks = [], [], []
+        shift = 0
+        for piece in self.pieces:
+            count = piece.position_count(self.dimension)
+            bits = max(1, (count - 1).bit_length())
+            self.shifts.append(shift)
+            self.field_masks.append((1 << bits) - 1)
+            self.position_masks.append([self.footprint_mask(piece, position) for position in range(count)])
+            shift += bits
+        self.state_bits = shift
+        if self.goal_position is None:
+            self.goal_position = self.pieces[self.target].position_count(self.dimension) - 1
+
+    def footprint_mask(self, piece: SlidingPiece, position: int) -> int:
+        top_left = piece.coordinate(position)
+        row_bits = (1 << piece.dimension.length) - 1
+        mask = 0
+        for row in range(top_left.row, top_left.row + piece.dimension.height):
+            mask |= row_bits << (row * self.dimension.length + top_left.column)
+        return mask
+
+    @classmethod
+    def from_board(cls, board: Board, target_mover_id: int, goal_position: Optional[int] = None) -> 'SlidingPuzzle':
+        pieces, positions = [], []
+        wall_mask = 0
+        target = None
+        for entity in board.entities.values():
+            coordinate = entity.top_left_coordinate
+            if coordinate is None:
+                continue
+            if isinstance(entity, (HorizontalMover, VerticalMover)):
+                slides_along_row = isinstance(entity, HorizontalMover)
+                if entity.mover_id == target_mover_id:
+                    target = len(pieces)
+                pieces.append(SlidingPiece(
+                    mover_id=entity.mover_id,
+                    slides_along_row=slides_along_row,
+                    fixed=coordinate.row if slides_along_row else coordinate.column,
+                    dimension=entity.dimension
+                ))
+                positions.append(coordinate.column if slides_along_row else coordinate.row)
+            else:
+                for cell in board.get_cells_occupied_by_entity(entity):
+                    wall_mask |= 1 << board.square_index(cell.coordinate)
+        if target is None:
+            raise ValueError(f"No HorizontalMover or VerticalMover with id {target_mover_id} on the board.")
+
+        puzzle = cls(dimension=board.dimension, pieces=tuple(pieces), target=target, start=0,
+                     wall_mask=wall_mask, goal_position=goal_position)
+        puzzle.start = puzzle.encode(positions)
+        return puzzle
+
+    def encode(self, positions: Sequence[int]) -> int:
+        state = 0
+        for shift, position in zip(self.shifts, positions):
+            state |= position << shift
+        return state
+
+    def decode(self, state: int) -> List[int]:
+        return [(state >> shift) & mask for shift, mask in zip(self.shifts, self.field_masks)]
+
+    def is_solved(self, state: int) -> bool:
+        return (state >> self.shifts[self.target]) & self.field_masks[self.target] == self.goal_position
+
+    def neighbors(self, state: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield (next state, piece index, new position) for every single slide of any distance."""
+        shifts, field_masks, position_masks = self.shifts, self.field_masks, self.position_masks
+        positions = [(state >> shift) & mask for shift, mask in zip(shifts, field_masks)]
+        occupancy = self.wall_mask
+        for masks, position in zip(position_masks, positions):
+            occupancy |= masks[position]
+
+        for piece, position in enumerate(positions):
+            masks = position_masks[piece]
+            others = occupancy ^ masks[position]
+            shift = shifts[piece]
+            cleared = state & ~(field_masks[piece] << shift)
+            candidate = position - 1
+            while candidate >= 0 and not masks[candidate] & others:
+                yield cleared | (candidate << shift), piece, candidate
+                candidate -= 1
+            candidate, end = position + 1, len(masks)
+            while candidate < end and not masks[candidate] & others:
+                yield cleared | (candidate << shift), piece, candidate
+                candidate += 1
+
+
+class SlideTables:
+    """Bitmask tables that let numpy expand a whole layer of packed states at once.
+
+    The occupancy of every state in a batch is kept as 64-bit words. For every
+    piece and position the tables hold the words it covers and the squares it
+    newly enters when it slides there one step, so a slide of any distance is
+    a few array operations per step rather than a Python loop per state.
+    """
+    # States expanded per batch; bounds the occupancy and neighbor buffers.
+    CHUNK_STATES = 1 << 14
+    WORD_BITS = 64
+
+    def __init__(self, puzzle: SlidingPuzzle):
+        self.word_count = -(-puzzle.dimension.area() // self.WORD_BITS)
+        self.wall_words = self.words(puzzle.wall_mask)
+        self.goal = (np.uint64(puzzle.shifts[puzzle.target]), np.uint64(puzzle.field_masks[puzzle.target]),
+                     np.uint64(puzzle.goal_position))
+        self.pieces = []
+        for piece, shift, field_mask, footprints in zip(puzzle.pieces, puzzle.shifts, puzzle.field_masks,
+                                                       puzzle.position_masks):
+            count = len(footprints)
+            # Squares newly covered on reaching a position from the one above it, and from the one below it.
+            entering_lower = [footprints[position] & ~footprints[position + 1] if position + 1 < count else 0
+                              for position in range(count)]
+            entering_upper = [footprints[position] & ~footprints[position - 1] if position > 0 else 0
+                              for position in range(count)]
+            self.pieces.append((
+                np.uint64(shift), np.uint64(field_mask), np.uint64(field_mask << shift), count,
+                self.word_table(footprints), self.word_table(entering_lower), self.word_table(entering_upper),
+            ))
+        # Largest transient buffer a batch needed, for SlidingSolution.peak_bytes.
+        self.peak_buffer_bytes = 0
+
+    def words(self, mask: int) -> List[int]:
+        word_mask = (1 << self.WORD_BITS) - 1
+        return [(mask >> (word * self.WORD_BITS)) & word_mask for word in range(self.word_count)]
+
+    def word_table(self, masks: List[int]) -> List['np.ndarray']:
+        """One uint64 array per occupancy word, indexed by position."""
+        split = [self.words(mask) for mask in masks]
+        return [np.array([words[word] for words in split], dtype=np.uint64) for word in range(self.word_count)]
+
+    def solved(self, layer: 'np.ndarray') -> 'np.ndarray':
+        shift, field_mask, goal = self.goal
+        return layer[((layer >> shift) & field_mask) == goal]
+
+    def expand(self, states: 'np.ndarray') -> 'np.ndarray':
+        """Every state one slide of any distance away, with duplicates."""
+        occupancy = [np.full(len(states), wall, dtype=np.uint64) for wall in self.wall_words]
+        positions = []
+        for shift, field_mask, _, _, footprints, _, _ in self.pieces:
+            position = ((states >> shift) & field_mask).astype(np.intp)
+            for word, table in zip(occupancy, footprints):
+                word |= table[position]
+            positions.append(position)
+
+        neighbors = []
+        every_state = np.arange(len(states))
+        for (shift, _, clear_mask, position_count, _, entering_lower, entering_upper), start in zip(
+                self.pieces, positions):
+            cleared = states & ~clear_mask
+            for step, entering in ((-1, entering_lower), (1, entering_upper)):
+                moving, position = every_state, start
+                while len(moving):
+                    position = position + step
+                    on_board = (position >= 0) & (position < position_count)
+                    moving, position = moving[on_board], position[on_board]
+                    if not len(moving):
+                        break
+                    free = (occupancy[0][moving] & entering[0][position]) == 0
+                    for word, table in zip(occupancy[1:], entering[1:]):
+                        free &= (word[moving] & table[position]) == 0
+                    moving, position = moving[free], position[free]
+                    neighbors.append(cleared[moving] | (position.astype(np.uint64) << shift))
+        result = np.concatenate(neighbors) if neighbors else np.empty(0, dtype=np.uint64)
+        self.peak_buffer_bytes = max(self.peak_buffer_bytes, 2 * result.nbytes + sum(
+            array.nbytes for array in occupancy + positions))
+        return result
+
+
+@dataclass
+class SlidingSolution:
+    # (mover_id, destination top-left) per slide, in order.
+    moves: List[Tuple[int, GridCoordinate]]
+    states_explored: int
+    # The sorted layers kept for rebuilding the path; these double as the duplicate-check frontier.
+    layer_bytes: int
+    # Estimated high-water mark: the layers plus the largest transient expansion buffer.
+    peak_bytes: int
+
+    @property
+    def bytes_per_state(self) -> float:
+        return self.peak_bytes / self.states_explored if self.states_explored else 0.0
+
+
+def slide_tables(puzzle: SlidingPuzzle) -> Optional[SlideTables]:
+    """Tables for the vectorized search, or None when numpy is missing or states do not fit in 64 bits."""
+    return SlideTables(puzzle) if np is not None and puzzle.state_bits <= 64 else None
+
+
+def _sorted_unique(states: 'np.ndarray') -> 'np.ndarray':
+    # Sorting and dropping repeats beats np.unique, which hashes integer input.
+    states = np.sort(states)
+    if len(states) < 2:
+        return states
+    keep = np.empty(len(states), dtype=bool)
+    keep[0] = True
+    np.not_equal(states[1:], states[:-1], out=keep[1:])
+    return states[keep]
+
+
+def _make_layer(states: Iterable[int], tables: Optional[SlideTables]) -> StateLayer:
+    if tables is None:
+        return sorted(set(states))
+    return _sorted_unique(np.fromiter(states, dtype=np.uint64))
+
+
+def _sorted_difference(states: 'np.ndarray', excluded: 'np.ndarray') -> 'np.ndarray':
+    """States not in `excluded`; both sorted."""
+    if not len(states) or not len(excluded):
+        return states
+    index = np.minimum(np.searchsorted(excluded, states), len(excluded) - 1)
+    return states[excluded[index] != states]
+
+
+def _next_layer(puzzle: SlidingPuzzle, tables: Optional[SlideTables], previous: StateLayer,
+                current: StateLayer) -> StateLayer:
+    """States one slide from `current` that are in neither `current` nor `previous`."""
+    if tables is None:
+        seen = set(previous)
+        seen.update(current)
+        return sorted({neighbor for state in current for neighbor, _, _ in puzzle.neighbors(state)
+                       if neighbor not in seen})
+    upcoming = np.empty(0, dtype=np.uint64)
+    pending, pending_count = [], 0
+    for start in range(0, len(current), tables.CHUNK_STATES):
+        batch = _sorted_unique(tables.expand(current[start:start + tables.CHUNK_STATES]))
+        batch = _sorted_difference(_sorted_difference(_sorted_difference(batch, current), previous), upcoming)
+        pending.append(batch)
+        pending_count += len(batch)
+        # Batches repeat each other's states, so fold them in once they outgrow the layer so far; this keeps
+        # the buffer within a small multiple of the finished layer.
+        if pending_count > len(upcoming):
+            upcoming = _sorted_unique(np.concatenate([upcoming] + pending))
+            pending, pending_count = [], 0
+        tables.peak_buffer_bytes = max(tables.peak_buffer_bytes, 2 * (upcoming.nbytes + 8 * pending_count))
+    return _sorted_unique(np.concatenate([upcoming] + pending)) if pending else upcoming
+
+
+def solved_states(puzzle: SlidingPuzzle, layer: StateLayer,
+                  tables: Optional[SlideTables] = None) -> StateLayer:
+    """The states of the layer with the target at its goal, still sorted."""
+    if tables is not None:
+        return tables.solved(layer)
+    return [state for state in layer if puzzle.is_solved(state)]
+
+
+def _layer_bytes(layer: StateLayer, state_bits: int) -> int:
+    if np is not None and isinstance(layer, np.ndarray):
+        return layer.nbytes
+    # A list slot plus an int object per state.
+    return len(layer) * (8 + sys.getsizeof((1 << state_bits) - 1))
+
+
+def _layer_contains(layer: StateLayer, state: int) -> bool:
+    if np is not None and isinstance(layer, np.ndarray):
+        index = int(np.searchsorted(layer, np.uint64(state)))
+    else:
+        index = bisect_left(layer, state)
+    return index < len(layer) and layer[index] == state
+
+
+def bfs_layers(puzzle: SlidingPuzzle, sources: Iterable[int],
+               tables: Optional[SlideTables] = None) -> Iterator[StateLayer]:
+    """Yield breadth-first layers from every source at once; layer k holds states k slides from the nearest source.
+
+    Only the previous layer is kept for duplicate checks, which is enough because
+    slides are reversible. Stop consuming it to bound the search.
+    """
+    tables = tables if tables is not None else slide_tables(puzzle)
+    previous, current = _make_layer((), tables), _make_layer(sources, tables)
+    while len(current):
+        yield current
+        previous, current = current, _next_layer(puzzle, tables, previous, current)
+
+
+def solve(puzzle: SlidingPuzzle, max_states: Optional[int] = None) -> Optional[SlidingSolution]:
+    """Shortest slide sequence that brings the target to its goal, or None if there is none.
+
+    Raises StateLimitExceededError once more than max_states states have been
+    explored, so a truncated search is never mistaken for an unsolvable one.
+
+    Slides are reversible, so breadth-first layer k + 1 only has to be checked
+    against layers k - 1 and k. Layers are sorted uint64 arrays, 8 bytes a
+    state, expanded a batch at a time with numpy and deduplicated by sorted
+    lookups; the same arrays are kept to rebuild the path at the end. Building
+    a layer briefly takes a few times its own size on top of that, so large
+    searches peak around 20-25 bytes per explored state. Puzzles whose states
+    need more than 64 bits, or runs without numpy, fall back to expanding one
+    state at a time.
+    """
+    tables = slide_tables(puzzle)
+    explored, peak_bytes, archived_bytes = 0, 0, 0
+    layers: List[StateLayer] = []
+    goals: StateLayer = []
+    for layer in bfs_layers(puzzle, [puzzle.start], tables):
+        explored += len(layer)
+        if max_states is not None and explored > max_states:
+            raise StateLimitExceededError(f"Search passed {max_states} states without reaching the goal.")
+        layers.append(layer)
+        archived_bytes += _layer_bytes(layer, puzzle.state_bits)
+        transient = tables.peak_buffer_bytes if tables is not None else 0
+        peak_bytes = max(peak_bytes, archived_bytes + transient)
+        goals = solved_states(puzzle, layer, tables)
+        if len(goals):
+            break
+
+    if not len(goals):
+        return None
+
+    moves = []
+    state = int(goals[0])
+    for depth in range(len(layers) - 1, 0, -1):
+        for parent, piece, _ in puzzle.neighbors(state):
+            if _layer_contains(layers[depth - 1], parent):
+                slid = puzzle.pieces[piece]
+                position = puzzle.decode(state)[piece]
+                moves.append((slid.mover_id, slid.coordinate(position)))
+                state = parent
+                break
+    moves.reverse()
+    return SlidingSolution(moves=moves, states_explored=explored, layer_bytes=archived_bytes,
+                           peak_bytes=peak_bytes)
+
+
+def solve_board(board: Board, target_mover_id: int, goal_position: Optional[int] = None,
+                max_states: Optional[int] = None) -> Optional[SlidingSolution]:
+    return solve(SlidingPuzzle.from_board(board, target_mover_id, goal_position), max_states=max_states)
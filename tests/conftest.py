@@ -0,0 +1,25 @@
+from perft import save_baseline
+
+
+def pytest_addoption(parser):
+    parser.addoption("--save-perft-baseline", action="store_true",
+                     help="Record this run's perft nodes/sec as the throughput baseline instead of checking it.")
+
+
+def pytest_configure(config):
+    config.perft_results = []
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.perft_results:
+        return
+    terminalreporter.section("perft throughput")
+    for result in config.perft_results:
+        terminalreporter.write_line(f"{result.setup} depth {result.depth}: {result.nodes} nodes in "
+                                    f"{result.elapsed_seconds:.3f}s ({result.nodes_per_second:,.0f} nodes/sec)")
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if config.getoption("--save-perft-baseline") and config.perft_results:
+        save_baseline(config.perft_results)
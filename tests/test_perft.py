@@ -0,0 +1,43 @@
+import pytest
+
+from perft import BASELINE_PATH, MIN_TIMED_SECONDS, THROUGHPUT_TOLERANCE, known_cases, load_json, run_perft
+
+CASES = known_cases()
+CASE_IDS = [f"{setup}-depth{depth}" for setup, depth, _ in CASES]
+KNOWN_COUNTS = {(setup, depth): nodes for setup, depth, nodes in CASES}
+
+
+@pytest.fixture(scope="module")
+def perft_results():
+    """Each (setup, depth) is walked once and shared by the count and throughput checks."""
+    return {}
+
+
+@pytest.fixture
+def perft_result(request, perft_results):
+    setup, depth, _ = request.param
+    if (setup, depth) not in perft_results:
+        result = run_perft(setup, depth)
+        perft_results[setup, depth] = result
+        request.config.perft_results.append(result)
+    return perft_results[setup, depth]
+
+
+@pytest.mark.parametrize("perft_result", CASES, ids=CASE_IDS, indirect=True)
+def test_leaf_count_matches_known_good(perft_result):
+    assert perft_result.nodes == KNOWN_COUNTS[perft_result.setup, perft_result.depth]
+
+
+@pytest.mark.parametrize("perft_result", CASES, ids=CASE_IDS, indirect=True)
+def test_throughput_against_baseline(request, perft_result):
+    rate = f"{perft_result.setup} depth {perft_result.depth}: {perft_result.nodes} nodes in " \
+           f"{perft_result.elapsed_seconds:.3f}s ({perft_result.nodes_per_second:,.0f} nodes/sec)"
+    if request.config.getoption("--save-perft-baseline"):
+        pytest.skip(f"{rate}; recording the baseline")
+    saved_rate = load_json(BASELINE_PATH).get(perft_result.setup, {}).get(str(perft_result.depth))
+    if not saved_rate:
+        pytest.skip(f"{rate}; no baseline in {BASELINE_PATH.name}, run pytest --save-perft-baseline")
+    if perft_result.elapsed_seconds < MIN_TIMED_SECONDS:
+        pytest.skip(f"{rate}; too short to time reliably")
+    ratio = perft_result.nodes_per_second / saved_rate
+    assert ratio >= THROUGHPUT_TOLERANCE, f"{rate} is {ratio:.2f}x baseline, a throughput regression"
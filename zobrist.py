@@ -0,0 +1,25 @@
+from functools import lru_cache
+from hashlib import blake2b
+
+from geometry import Dimension
+from grid_entity import GridEntity
+
+# Keys are cheap to recompute, so the cache only needs to cover the squares a game keeps revisiting.
+# Unbounded, it would grow with every entity type, size and square ever seen on big or generated boards.
+KEY_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _square_key(type_name: str, dimension: Dimension, index: int, variant: int) -> int:
+    # Derived from a hash rather than a seeded RNG so every process agrees on the keys.
+    text = f"{variant}:{type_name}:{dimension.length}x{dimension.height}:{index}"
+    return int.from_bytes(blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+def zobrist_key(entity: GridEntity, index: int, variant: int = 0) -> int:
+    """64-bit key for an entity of this type and size whose top-left is on square `index`.
+
+    Board uses variant 0. Other variants give independent key sets for callers
+    that hash extra state, such as which side owns a piece.
+    """
+    return _square_key(type(entity).__name__, entity.dimension, index, variant)